@@ -3,6 +3,12 @@ from models.note import Note
 from datetime import datetime
 
 class Folder:
+    # Set by invalidate_sort(), i.e. on every change to `notes`; DataManager's caches key on
+    # (id, notes_version). Drawn from one shared counter so a folder re-created under the
+    # same id can never repeat a version an earlier instance had.
+    notes_version = 0
+    _last_notes_version = 0
+
     def __init__(self, name="New Folder", folder_id=None, notes=None, is_pinned=False, is_archived=False, priority=0, created_at=None, color=None, is_locked=False, order=0, cover_image=None, description=None, view_mode="list",
                  trash_original_notebook_id=None, trash_original_notebook_name=None, page_size="free", editor_background_color=None):
         self.id = folder_id if folder_id else str(uuid.uuid4())
@@ -23,18 +29,85 @@ class Folder:
         self.trash_original_notebook_name = trash_original_notebook_name
         self.page_size = page_size
         self.editor_background_color = editor_background_color
+        self._created_ts = None # (created_at, timestamp) parse cache, runtime only
+        self._sort_cache = None # (Note.sort_generation, sorted notes, {note_id: index}), runtime only
+        self._newest_cache = None # (Note.sort_generation, notes newest first), runtime only
+        self._note_positions = {} # note_id -> index in self.notes, verified on every hit
+
+    @property
+    def created_timestamp(self):
+        """POSIX timestamp of `created_at`, parsed once and reused until `created_at` changes."""
+        cached = self._created_ts
+        if cached is None or cached[0] != self.created_at:
+            ts = 0.0
+            created = self.created_at
+            if created and isinstance(created, str):
+                try:
+                    ts = datetime.fromisoformat(created).timestamp()
+                except ValueError:
+                    pass # malformed value: cached as 0.0 so it is not re-parsed
+            cached = self._created_ts = (self.created_at, ts)
+        return cached[1]
+
+    @property
+    def notes(self):
+        return self._notes
+
+    @notes.setter
+    def notes(self, value):
+        self._notes = value
+        self.invalidate_sort()
+
+    def _sorted_state(self):
+        # Membership changes call invalidate_sort(); pin/priority/order edits bump Note.sort_generation
+        cached = self._sort_cache
+        if cached is None or cached[0] != Note.sort_generation:
+            ordered = sorted(self.notes, key=Note.sort_key)
+            cached = self._sort_cache = (Note.sort_generation, ordered, {n.id: i for i, n in enumerate(ordered)})
+        return cached
+
+    @property
+    def sorted_notes(self):
+        """Notes in display order (`Note.sort_key`), cached until the folder changes."""
+        return list(self._sorted_state()[1])
+
+    def sort_index_of(self, note_id):
+        """0-based display position of a note, or None if it is not in this folder."""
+        return self._sorted_state()[2].get(note_id)
+
+    def notes_newest_first(self):
+        """Notes ordered by `created_at` descending; cached, treat as read-only."""
+        cached = self._newest_cache
+        if cached is None or cached[0] != Note.sort_generation:
+            cached = self._newest_cache = (Note.sort_generation, sorted(self.notes, key=lambda n: n.created_at, reverse=True))
+        return cached[1]
+
+    def invalidate_sort(self):
+        """Drop the cached orderings; call after editing `notes` in place."""
+        self._sort_cache = None
+        self._newest_cache = None
+        Folder._last_notes_version += 1
+        self.notes_version = Folder._last_notes_version
 
     def add_note(self, note: Note):
         self.notes.append(note)
+        self.invalidate_sort()
 
     def remove_note(self, note_id):
         self.notes = [n for n in self.notes if n.id != note_id]
 
     def get_note_by_id(self, note_id):
-        for note in self.notes:
-            if note.id == note_id:
-                return note
-        return None
+        notes = self.notes
+        pos = self._note_positions.get(note_id)
+        # `notes` is also reassigned or edited directly, so re-index when a hit is stale
+        if pos is None or pos >= len(notes) or notes[pos].id != note_id:
+            positions = self._note_positions = {}
+            for i, n in enumerate(notes):
+                positions.setdefault(n.id, i) # first match wins, as with a linear scan
+            pos = positions.get(note_id)
+            if pos is None:
+                return None
+        return notes[pos]
 
     def to_dict(self):
         return {
@@ -1,12 +1,32 @@
 import uuid
 from datetime import datetime
 
+def _sort_field(name):
+    """Plain attribute that bumps `Note.sort_generation` whenever its value changes."""
+    attr = "_" + name
+    def fget(self):
+        return self.__dict__[attr]
+    def fset(self, value):
+        d = self.__dict__
+        if attr not in d or d[attr] != value:
+            d[attr] = value
+            Note.sort_generation += 1
+    return property(fget, fset)
+
 class Note:
+    # Bumped on any change to a field that orders notes; Folder's sort caches compare against it
+    sort_generation = 0
+    is_pinned = _sort_field("is_pinned")
+    priority = _sort_field("priority")
+    order = _sort_field("order")
+    created_at = _sort_field("created_at")
+
     def __init__(self, title="New Note", content="", created_at=None, note_id=None, whiteboard_images=None, order=None, is_pinned=False, is_archived=False, priority=0, color=None, is_locked=False, last_scroll_position=0, content_splitter_sizes=None, cover_image=None, description=None, last_opened=None, closed_at=None,
                  trash_original_folder_id=None, trash_original_folder_name=None, hide_from_recent=False, background_color=None, page_size="free"):
         self.id = note_id if note_id else str(uuid.uuid4())
         self.title = title
         self.content = content  # HTML content
+        self._whiteboard_loader = None # set by defer_whiteboard_images()
         self.whiteboard_images = whiteboard_images if whiteboard_images else {} # {res_name: b64_data}
         self.created_at = created_at if created_at else datetime.now().isoformat(timespec='microseconds')
         self.order = order if order is not None else 0
@@ -26,6 +46,28 @@ class Note:
         self.hide_from_recent = hide_from_recent
         self.background_color = background_color
         self.page_size = page_size
+        # Runtime-only references, never serialized
+        self._parent_folder = None # set by DataManager.get_recent_notes
+        self._trash_path = None # set for items loaded from .trash
+
+    @property
+    def whiteboard_images(self):
+        """Embedded image data; fetched on first access if it was deferred at load time."""
+        loader = self._whiteboard_loader
+        if loader is not None:
+            self._whiteboard_images = loader()
+            self._whiteboard_loader = None
+        return self._whiteboard_images
+
+    @whiteboard_images.setter
+    def whiteboard_images(self, value):
+        self._whiteboard_loader = None
+        self._whiteboard_images = value
+
+    def defer_whiteboard_images(self, loader):
+        """Release the image data; `loader()` must return it again when it is next needed."""
+        self._whiteboard_images = {}
+        self._whiteboard_loader = loader
 
     def to_dict(self):
         return {
@@ -1,14 +1,15 @@
 from PyQt6.QtGui import QTextDocument, QPageSize, QAbstractTextDocumentLayout, QPageLayout, QFont, QPainter, QImage
 from PyQt6.QtCore import QSizeF, Qt, QMarginsF, QRectF
-from PyQt6.QtWidgets import QApplication
 from PyQt6.QtPrintSupport import QPrinter
 
 import logging
 import re
 import requests
 import base64
+import time
 from urllib.parse import quote
 from datetime import datetime
+from collections import ChainMap
 from util.logger import logger
 
 # Cache for emoji data URIs to avoid redundant network calls
@@ -34,22 +35,39 @@ def fetch_emoji_svg(emoji):
         pass
     return emoji, None
 
+_EMOJI_RE = re.compile(r'([\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\u2600-\u26FF\u2700-\u27BF])')
+# Failed lookups are not retried for this long, so one offline export doesn't time out per note
+EMOJI_RETRY_SECONDS = 60
+_EMOJI_MISSES = {} # emoji -> time.monotonic() of its last failed fetch
+
+def _fetch_missing_emojis(emojis):
+    now = time.monotonic()
+    missing = [e for e in emojis if e not in EMOJI_CACHE
+               and (e not in _EMOJI_MISSES or now - _EMOJI_MISSES[e] >= EMOJI_RETRY_SECONDS)]
+    if not missing:
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(missing))) as executor:
+        future_to_emoji = {executor.submit(fetch_emoji_svg, emoji): emoji for emoji in missing}
+        for future in as_completed(future_to_emoji):
+            emoji, img_tag = future.result()
+            if img_tag:
+                EMOJI_CACHE[emoji] = img_tag
+            else:
+                _EMOJI_MISSES[emoji] = time.monotonic()
+
+def prefetch_emojis(htmls):
+    """Fetch the emojis used across several documents in one parallel batch."""
+    needed = set()
+    for html in htmls:
+        if html:
+            needed.update(_EMOJI_RE.findall(html))
+    _fetch_missing_emojis(needed)
+
 def process_html_emojis(html):
     """Replaces unicode emojis in HTML with high-fidelity SVGs using parallel fetching."""
     if not html: return html
-    emoji_pattern = r'([\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\u2600-\u26FF\u2700-\u27BF])'
-    needed_emojis = set(re.findall(emoji_pattern, html))
-    missing_emojis = [e for e in needed_emojis if e not in EMOJI_CACHE]
-    
-    if missing_emojis:
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_emoji = {executor.submit(fetch_emoji_svg, emoji): emoji for emoji in missing_emojis}
-            for future in as_completed(future_to_emoji):
-                emoji, img_tag = future.result()
-                if img_tag:
-                    EMOJI_CACHE[emoji] = img_tag
-    
-    return re.sub(emoji_pattern, lambda m: EMOJI_CACHE.get(m.group(1), m.group(1)), html)
+    _fetch_missing_emojis(set(_EMOJI_RE.findall(html)))
+    return _EMOJI_RE.sub(lambda m: EMOJI_CACHE.get(m.group(1), m.group(1)), html)
 
 # --- NEW HELPERS ---
 
@@ -363,67 +381,70 @@ def _print_document_with_footer(doc, printer, footer_text=None, progress_callbac
     
     from PyQt6.QtGui import QColor, QBrush
     
-    for i in range(page_count):
-        if progress_callback and callable(progress_callback):
-            progress_callback(i + 1, page_count)
-            QApplication.processEvents()
+    try:
+        for i in range(page_count):
+            if progress_callback and callable(progress_callback):
+                # May raise to cancel; exports run on a worker thread, so no event pumping here
+                progress_callback(i + 1, page_count)
 
-        if i > 0:
-            printer.newPage()
+            if i > 0:
+                printer.newPage()
 
-        if theme != 0: # Anything other than Light
-            painter.save()
-            page_rect_dev = printer.pageRect(QPrinter.Unit.DevicePixel)
-            paper_rect_dev = printer.paperRect(QPrinter.Unit.DevicePixel)
-            left_margin = page_rect_dev.left() - paper_rect_dev.left()
-            top_margin = page_rect_dev.top() - paper_rect_dev.top()
-            full_page_rect = QRectF(-left_margin, -top_margin, paper_rect_dev.width(), paper_rect_dev.height())
+            if theme != 0: # Anything other than Light
+                painter.save()
+                page_rect_dev = printer.pageRect(QPrinter.Unit.DevicePixel)
+                paper_rect_dev = printer.paperRect(QPrinter.Unit.DevicePixel)
+                left_margin = page_rect_dev.left() - paper_rect_dev.left()
+                top_margin = page_rect_dev.top() - paper_rect_dev.top()
+                full_page_rect = QRectF(-left_margin, -top_margin, paper_rect_dev.width(), paper_rect_dev.height())
             
-            if theme == 1:
-                bg_color = QColor("#1e1e1e")
-            elif theme == 2:
-                bg_color = QColor("#f5f0e8")
-            elif isinstance(theme, str) and theme.startswith("#"):
-                bg_color = QColor(theme)
-            else:
-                bg_color = Qt.GlobalColor.white
+                if theme == 1:
+                    bg_color = QColor("#1e1e1e")
+                elif theme == 2:
+                    bg_color = QColor("#f5f0e8")
+                elif isinstance(theme, str) and theme.startswith("#"):
+                    bg_color = QColor(theme)
+                else:
+                    bg_color = Qt.GlobalColor.white
 
-            painter.fillRect(full_page_rect, QBrush(bg_color))
-            painter.restore()
+                painter.fillRect(full_page_rect, QBrush(bg_color))
+                painter.restore()
 
-        painter.save()
-        painter.scale(scale, scale)
-        painter.translate(0, -i * layout_rect.height())
-        clip_rect = QRectF(0, i * layout_rect.height(), layout_rect.width(), layout_rect.height())
-        doc.drawContents(painter, clip_rect)
-        painter.restore()
+            painter.save()
+            painter.scale(scale, scale)
+            painter.translate(0, -i * layout_rect.height())
+            clip_rect = QRectF(0, i * layout_rect.height(), layout_rect.width(), layout_rect.height())
+            doc.drawContents(painter, clip_rect)
+            painter.restore()
 
-        painter.save()
-        font = QFont("Segoe UI", 9)
-        painter.setFont(font)
-        if theme == 1:
-            painter.setPen(Qt.GlobalColor.lightGray)
-        elif theme == 2:
-            painter.setPen(QColor("#8e5c2e")) # Brownish for sepia
-        elif isinstance(theme, str) and theme.startswith("#"):
-            # Auto-detect brightness for footer text
-            c = QColor(theme)
-            brightness = (c.red() * 299 + c.green() * 587 + c.blue() * 114) / 1000
-            if brightness < 128:
+            painter.save()
+            font = QFont("Segoe UI", 9)
+            painter.setFont(font)
+            if theme == 1:
                 painter.setPen(Qt.GlobalColor.lightGray)
+            elif theme == 2:
+                painter.setPen(QColor("#8e5c2e")) # Brownish for sepia
+            elif isinstance(theme, str) and theme.startswith("#"):
+                # Auto-detect brightness for footer text
+                c = QColor(theme)
+                brightness = (c.red() * 299 + c.green() * 587 + c.blue() * 114) / 1000
+                if brightness < 128:
+                    painter.setPen(Qt.GlobalColor.lightGray)
+                else:
+                    painter.setPen(Qt.GlobalColor.darkGray)
             else:
-                painter.setPen(Qt.GlobalColor.darkGray)
-        else:
-            painter.setPen(Qt.GlobalColor.gray)
+                painter.setPen(Qt.GlobalColor.gray)
 
-        display_text = f"Page {i + 1} of {page_count}"
-        if footer_text:
-            display_text = f"{footer_text} - {display_text}"
+            display_text = f"Page {i + 1} of {page_count}"
+            if footer_text:
+                display_text = f"{footer_text} - {display_text}"
             
-        painter.drawText(device_rect, Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter, display_text)
-        painter.restore()
+            painter.drawText(device_rect, Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter, display_text)
+            painter.restore()
         
-    painter.end()
+    finally:
+        # Also on cancellation, so the printer releases the partial file
+        painter.end()
 
 def export_note_to_pdf(note, output_path, progress_callback=None, theme=0):
     printer = QPrinter(QPrinter.PrinterMode.HighResolution)
@@ -783,29 +804,25 @@ def apply_theme_to_html(html, theme=0):
     return html
 
 def process_images_for_pdf(html, whiteboard_images=None, page_metrics=None, theme=0):
-    if not whiteboard_images: return html
+    # `is None`, not truthiness: len() of a ChainMap builds the union of every note's keys
+    if whiteboard_images is None: return html
     if not page_metrics:
         page_metrics = {'usable_width': 718, 'usable_height': 1000}
     
     usable_w = page_metrics['usable_width']
     usable_h = page_metrics['usable_height']
     
-    image_map = {}
-    for res_name, b64_data in whiteboard_images.items():
-        if res_name.endswith("_meta") or res_name.endswith("_source"): continue
-        if not b64_data.startswith('data:image'):
-            image_map[res_name] = f"data:image/png;base64,{b64_data}"
-        else:
-            image_map[res_name] = b64_data
-
-    if not image_map: return html
-
+    # Only resources the HTML references are looked up, so `whiteboard_images` can be any
+    # mapping (e.g. a ChainMap over per-note dicts) and is never copied or fully walked
     pattern = r'<img\s+[^>]*?src=([\"\'])(.*?)\1[^>]*?>'
     
     def wrapper(m):
         res_name = m.group(2)
-        if res_name in image_map:
-            img_data = image_map[res_name]
+        b64_data = None
+        if not (res_name.endswith("_meta") or res_name.endswith("_source")):
+            b64_data = whiteboard_images.get(res_name)
+        if b64_data:
+            img_data = b64_data if b64_data.startswith('data:image') else f"data:image/png;base64,{b64_data}"
             scaled_w = usable_w
             scaled_h = None
             try:
@@ -1044,6 +1061,10 @@ def generate_folder_html(folder, for_preview=False, theme=0, start_index=1):
     
     # Collect all IDs for link resolution
     available_note_ids = {n.id for n in sorted_notes}
+
+    if not for_preview:
+        # One network round for the whole folder instead of one per note
+        prefetch_emojis(n.content for n in sorted_notes)
     
     for idx, note in enumerate(sorted_notes, start_index):
         # Use new modular helper
@@ -1121,10 +1142,8 @@ def export_folder_to_pdf(folder, output_path, progress_callback=None, theme=0):
     doc.setDocumentMargin(5)
     doc.setDefaultFont(QFont("Segoe UI", 7))
     
-    all_whiteboard_images = {}
-    for note in folder.notes:
-        wb_imgs = getattr(note, 'whiteboard_images', {})
-        all_whiteboard_images.update(wb_imgs)
+    # Later notes win on duplicate names, as a sequential dict.update() would
+    all_whiteboard_images = ChainMap(*[note.whiteboard_images for note in reversed(folder.notes)])
 
     html_content = generate_folder_html(folder, for_preview=False, theme=theme)
     html_content = process_images_for_pdf(html_content, all_whiteboard_images, page_metrics, theme)
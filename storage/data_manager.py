@@ -1,8 +1,10 @@
+import heapq
 import json
 import os
 import shutil
 import re
 import tempfile
+import threading
 import time
 from glob import glob
 from models.folder import Folder
@@ -17,6 +19,16 @@ class DataManager:
     def __init__(self):
         self.folders = []
         self.notebooks = []
+        self._folder_index = None # folder_id -> Folder, rebuilt lazily after folder list changes
+        self._note_index = {} # note_id -> (Folder, Note), verified on every hit
+        self._aggregate_cache = None # (signature, active notes newest-first, archived-folder notes)
+        self._recent_cache = None # (signature, limit, notes)
+        self._recent_version = 0 # bumped when hide_from_recent flags change
+        self._trash_cache = {} # key -> (.trash listing signature, items)
+        self.settings_save_scheduler = None # optional callable that defers save_settings() (UI debounce)
+        self._pending_note_writes = {} # file path -> serialized note JSON staged by stage_note_write()
+        self._pending_lock = threading.Lock()
+        self._note_write_lock = threading.Lock() # Serializes note file writes across threads
         self.settings = {
             "theme_mode": "light",
             "whiteboard_split_view": False,
@@ -30,11 +42,18 @@ class DataManager:
 
     def get_recent_notes(self, limit=50):
         """Return all notes across all folders, sorted by most recently modified (or created)."""
+        # notes_version is unique per list change across all folders, so (id, version) is
+        # enough to tell a re-created folder apart without holding on to Folder objects
+        signature = (self._recent_version, Note.sort_generation, tuple((f.id, f.notes_version) for f in self.folders))
+        cached = self._recent_cache
+        if cached is not None and cached[0] == signature and cached[1] == limit:
+            return list(cached[2])
+
         all_notes = []
         for folder in self.folders:
             if folder.id.startswith('.'): continue # Skip system folders
             for note in folder.notes:
-                if not getattr(note, 'hide_from_recent', False):
+                if not note.hide_from_recent:
                     # Attach parent folder reference for context (runtime only)
                     note._parent_folder = folder
                     all_notes.append(note)
@@ -42,30 +61,74 @@ class DataManager:
         # Sort by last match of date. Currently only created_at is strictly tracked on Note.
         # Ideally we'd have modified_at. using created_at for now as proxy or if available.
         # If created_at is string, strict sort might be tricky if formats vary, but ISO is sortable.
-        all_notes.sort(key=lambda n: n.created_at, reverse=True)
-        return all_notes[:limit]
+        # Only the top `limit` are shown, so select them instead of sorting everything.
+        recent = heapq.nlargest(limit, all_notes, key=lambda n: n.created_at)
+        self._recent_cache = (signature, limit, recent)
+        return list(recent)
+
+    def _aggregate_lists(self):
+        # Folder.notes_version moves on every list change, wherever it is made
+        signature = (Note.sort_generation, tuple((f.id, f.notes_version, f.is_archived) for f in self.folders))
+        if self._aggregate_cache is None or self._aggregate_cache[0] != signature:
+            archived = []
+            for folder in self.folders:
+                if folder.is_archived:
+                    archived.extend(folder.notes)
+            # Each folder keeps its own newest-first order cached, so a rebuild after a
+            # change in one folder re-sorts only that folder and merges the rest.
+            active = list(heapq.merge(*(f.notes_newest_first() for f in self.folders if not f.is_archived),
+                                      key=lambda n: n.created_at, reverse=True))
+            self._aggregate_cache = (signature, active, archived)
+        return self._aggregate_cache
+
+    def get_all_active_notes_sorted(self):
+        """Notes of all non-archived folders, newest first."""
+        return list(self._aggregate_lists()[1])
+
+    def get_archived_folder_notes(self):
+        """Notes of all archived folders."""
+        return list(self._aggregate_lists()[2])
 
     def hide_note_from_recent(self, note_id):
         """Set hide_from_recent flag for a specific note."""
-        for folder in self.folders:
-            note = next((n for n in folder.notes if n.id == note_id), None)
-            if note:
-                note.hide_from_recent = True
-                self.save_note(folder, note)
-                return True
+        folder, note = self.find_note_by_id(note_id)
+        if note:
+            note.hide_from_recent = True
+            self._recent_version += 1
+            self.save_note(folder, note)
+            return True
         return False
 
     def clear_all_recent(self):
         """Hide all currently visible recent notes."""
         for folder in self.folders:
             for note in folder.notes:
-                if not getattr(note, 'hide_from_recent', False):
+                if not note.hide_from_recent:
                     note.hide_from_recent = True
                     self.save_note(folder, note)
+        self._recent_version += 1
         return True
 
+    def _trash_signature(self):
+        # One directory listing (names + mtimes) instead of parsing every trashed file
+        try:
+            with os.scandir(TRASH_DIR) as entries:
+                return tuple(sorted((e.name, e.stat().st_mtime_ns) for e in entries))
+        except OSError:
+            return None
+
+    def _cached_trash(self, key, build):
+        signature = self._trash_signature()
+        cached = self._trash_cache.get(key)
+        if cached is None or cached[0] != signature:
+            cached = self._trash_cache[key] = (signature, build())
+        return list(cached[1])
+
     def get_trash_notes(self, include_folders=True):
-        """Parse items from .trash directory (Notes and Folders)."""
+        """Parse items from .trash directory (Notes and Folders); cached until .trash changes."""
+        return self._cached_trash(("notes", include_folders), lambda: self._read_trash_notes(include_folders))
+
+    def _read_trash_notes(self, include_folders):
         trash_items = []
         if not os.path.exists(TRASH_DIR):
             return []
@@ -141,6 +204,9 @@ class DataManager:
 
     def get_trashed_folders(self):
         """Return a list of Folder objects reconstructed from TRASH_DIR subdirectories."""
+        return self._cached_trash("folders", self._read_trashed_folders)
+
+    def _read_trashed_folders(self):
         trashed_folders = []
         if not os.path.exists(TRASH_DIR):
             return []
@@ -292,10 +358,14 @@ class DataManager:
 
     def _safe_save_json(self, file_path, data):
         """Atomic write using temporary file and rename."""
+        self._safe_save_text(file_path, json.dumps(data, indent=4))
+
+    def _safe_save_text(self, file_path, text):
+        """Atomic write of already serialized text."""
         temp_fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix=".tmp")
         try:
             with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4)
+                f.write(text)
             # Ensure data is flushed to disk
             # Add retry logic for Windows PermissionError (WinError 5)
             import time
@@ -357,6 +427,7 @@ class DataManager:
     def load_data(self):
         """Load folders and notes from filesystem with optimizations."""
         self.folders = []
+        self._invalidate_indexes()
         if not os.path.exists(NOTES_DIR): return
         
         # Scan directories (Folders)
@@ -413,6 +484,9 @@ class DataManager:
                             if is_empty_title and not has_content:
                                 garbage_files.append(jf)
                             else:
+                                # Image payloads are only needed once a note is opened, exported or saved
+                                if note.whiteboard_images:
+                                    note.defer_whiteboard_images(self._whiteboard_images_loader(note, jf))
                                 notes.append(note)
                     except json.JSONDecodeError as e:
                         logger.error(f"Failed to decode note {jf}: {e}")
@@ -462,31 +536,93 @@ class DataManager:
                 self.folders.append(folder)
 
     def update_folder_last_note(self, folder_id, note_id):
-        """Update the last opened note ID for a folder."""
-        folders_meta = self.get_setting("folders_meta", {})
-        if folder_id not in folders_meta:
-            folders_meta[folder_id] = {}
+        """Update the last opened note ID for a folder. Returns True if it changed."""
+        folders_meta = self.settings.setdefault("folders_meta", {})
+        meta = folders_meta.setdefault(folder_id, {})
+        if meta.get("last_note_id") == note_id:
+            return False
         
-        folders_meta[folder_id]["last_note_id"] = note_id
-        self.set_setting("folders_meta", folders_meta)
-        self.save_settings()
+        meta["last_note_id"] = note_id
+        self.request_settings_save()
+        return True
 
     def save_note(self, folder, note):
         """Save a single note to disk with atomic write and robust error handling."""
         if not folder or not note: return
         
         try:
-            f_path = os.path.join(NOTES_DIR, self._sanitize(folder.name))
-            os.makedirs(f_path, exist_ok=True)
-            
-            # We use Note UUID as filename to allow title renaming without file renaming issues
-            n_path = os.path.join(f_path, f"{note.id}.json")
-            self._safe_save_json(n_path, note.to_dict())
+            n_path = self._note_path(folder, note)
+            text = json.dumps(note.to_dict(), indent=4)
+            with self._note_write_lock:
+                # This write is newer than anything staged for the same file
+                with self._pending_lock:
+                    self._pending_note_writes.pop(n_path, None)
+                self._write_note_file(n_path, text)
         except (IOError, OSError, PermissionError) as e:
             logger.error(f"Error saving note {note.id}: {e}")
         except Exception as e:
             logger.error(f"Unexpected error saving note {note.id}", exc_info=True)
 
+    def _note_path(self, folder, note):
+        # We use Note UUID as filename to allow title renaming without file renaming issues
+        return os.path.join(NOTES_DIR, self._sanitize(folder.name), f"{note.id}.json")
+
+    def _write_note_file(self, n_path, text):
+        os.makedirs(os.path.dirname(n_path), exist_ok=True)
+        self._safe_save_text(n_path, text)
+
+    def stage_note_write(self, folder, note):
+        """
+        Serialize a note now (caller's thread) and stage it for write_staged_note().
+        Returns the file path to pass on, or None if there is nothing to write.
+        """
+        if not folder or not note: return None
+        n_path = self._note_path(folder, note)
+        text = json.dumps(note.to_dict(), indent=4)
+        with self._pending_lock:
+            self._pending_note_writes[n_path] = text
+        return n_path
+
+    def write_staged_note(self, n_path):
+        """Write the latest staged text for `n_path`. Safe to call from a worker thread."""
+        with self._note_write_lock:
+            with self._pending_lock:
+                text = self._pending_note_writes.pop(n_path, None)
+            if text is None:
+                return # Already written by a newer save
+            try:
+                self._write_note_file(n_path, text)
+            except Exception as e:
+                logger.error(f"Error writing note file {n_path}: {e}")
+
+    def _settle_staged_writes(self, dir_path, note_id=None, write=True):
+        """
+        Write (or, with write=False, drop) what is staged for one note, or for every
+        note, in `dir_path` before its files are moved, so that no queued write
+        recreates them at the old path.
+        """
+        with self._note_write_lock:
+            # Holding the write lock: no write_staged_note() is part way through these paths
+            with self._pending_lock:
+                if note_id is not None:
+                    paths = [os.path.join(dir_path, f"{note_id}.json")]
+                else:
+                    paths = [p for p in self._pending_note_writes if os.path.dirname(p) == dir_path]
+                staged = [(p, self._pending_note_writes.pop(p)) for p in paths if p in self._pending_note_writes]
+            if write:
+                for n_path, text in staged:
+                    try:
+                        self._write_note_file(n_path, text)
+                    except Exception as e:
+                        logger.error(f"Error writing note file {n_path}: {e}")
+
+    def flush_staged_notes(self):
+        """Synchronously write everything still staged (e.g. on exit)."""
+        with self._pending_lock:
+            paths = list(self._pending_note_writes)
+        for n_path in paths:
+            self.write_staged_note(n_path)
+
     def add_folder(self, name):
         """Create a new folder directory."""
         safe_name = self._sanitize(name)
@@ -499,6 +635,7 @@ class DataManager:
         
         folder = Folder(name=safe_name, folder_id=safe_name)
         self.folders.append(folder)
+        self._invalidate_indexes()
         return folder
 
     def delete_folder(self, folder_id, permanent=False):
@@ -508,10 +645,12 @@ class DataManager:
              logger.warning(f"Attempted to delete protected folder: {folder_id}")
              return
 
-        folder = next((f for f in self.folders if f.id == folder_id), None)
+        folder = self.get_folder_by_id(folder_id)
         if not folder: return
 
         path = os.path.join(NOTES_DIR, self._sanitize(folder_id))
+        # Trashed folders keep their latest edits; permanently deleted ones need none
+        self._settle_staged_writes(self.get_folder_path(folder), write=not permanent)
         
         # 1. Clean up Notebook assignments (Shared logic)
         orig_nb = None
@@ -573,6 +712,7 @@ class DataManager:
                     shutil.rmtree(path)
                     
         self.folders = [f for f in self.folders if f.id != folder_id]
+        self._invalidate_indexes()
         self.save_settings() # Final save to ensure self.folders removal is noted in meta if needed
 
     def delete_note(self, folder, note_id):
@@ -586,13 +726,16 @@ class DataManager:
         note.trash_original_folder_name = folder.name
         
         folder.remove_note(note_id)
+        self._settle_staged_writes(self.get_folder_path(folder), note_id)
         
         target_note_path = os.path.join(NOTES_DIR, self._sanitize(folder.name), f"{note_id}.json")
         if os.path.exists(target_note_path):
             try:
                 # Save metadata in the JSON before moving
+                # (serialized before the file is truncated, as deferred images are read from it)
+                data = note.to_dict()
                 with open(target_note_path, 'w', encoding='utf-8') as f:
-                    json.dump(note.to_dict(), f, indent=4)
+                    json.dump(data, f, indent=4)
 
                 trash_note_path = os.path.join(TRASH_DIR, f"{note_id}_{int(time.time())}.json")
                 shutil.move(target_note_path, trash_note_path)
@@ -609,7 +752,7 @@ class DataManager:
             return False  # Cannot move to same folder
         
         # Find the note in source folder
-        note = next((n for n in source_folder.notes if n.id == note_id), None)
+        note = source_folder.get_note_by_id(note_id)
         if not note:
             return False
         
@@ -620,6 +763,7 @@ class DataManager:
         
         # Ensure target directory exists
         os.makedirs(target_dir, exist_ok=True)
+        self._settle_staged_writes(self.get_folder_path(source_folder), note_id)
         
         # Move the note file
         try:
@@ -640,11 +784,48 @@ class DataManager:
             print(f"Error moving note {note_id}: {e}")
             return False
     
+    def _whiteboard_images_loader(self, note, load_path):
+        """Loader for Note.defer_whiteboard_images that re-reads the note's file."""
+        def load():
+            # Prefer the note's current location; it may have moved since startup
+            paths = [load_path]
+            folder, live_note = self.find_note_by_id(note.id)
+            if live_note is note:
+                paths.insert(0, self._note_path(folder, note))
+            for path in paths:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        return json.load(f).get("whiteboard_images") or {}
+                except FileNotFoundError:
+                    continue
+                except Exception as e:
+                    logger.error(f"Failed to read whiteboard images from {path}: {e}")
+            logger.error(f"Whiteboard images for note {note.id} could not be reloaded")
+            return {}
+        return load
+
+    def _invalidate_indexes(self):
+        self._folder_index = None
+        self._note_index = {}
+
+    def _rebuild_note_index(self):
+        self._note_index = {n.id: (f, n) for f in self.folders for n in f.notes}
+
     def get_folder_by_id(self, folder_id):
-        for folder in self.folders:
-            if folder.id == folder_id:
-                return folder
-        return None
+        if self._folder_index is None:
+            self._folder_index = {f.id: f for f in self.folders}
+        return self._folder_index.get(folder_id)
+
+    def find_note_by_id(self, note_id):
+        """Return (folder, note) for an active note, or (None, None)."""
+        # Notes move between folders.notes lists outside DataManager, so a hit is
+        # verified and any miss or stale entry triggers a single rebuild.
+        entry = self._note_index.get(note_id)
+        if entry is None or entry[1] not in entry[0].notes \
+                or self.get_folder_by_id(entry[0].id) is not entry[0]:
+            self._rebuild_note_index()
+            entry = self._note_index.get(note_id)
+        return entry or (None, None)
         
     def get_folder_path(self, folder):
         """Get absolute filesystem path for a folder."""
@@ -669,11 +850,13 @@ class DataManager:
         
         # Rename directory on filesystem
         if os.path.exists(old_path):
+            self._settle_staged_writes(self.get_folder_path(folder))
             try:
                 os.rename(old_path, new_path)
                 # Update folder object
                 folder.name = safe_new_name
                 folder.id = safe_new_name  # Keep ID in sync with folder name
+                self._invalidate_indexes()
                 return True
             except Exception as e:
                 print(f"Failed to rename folder: {e}")
@@ -686,7 +869,7 @@ class DataManager:
         if not folder:
             return False
         
-        note = next((n for n in folder.notes if n.id == note_id), None)
+        note = folder.get_note_by_id(note_id)
         if not note:
             return False
         
@@ -716,7 +899,7 @@ class DataManager:
             return False
         
         # Find the note
-        note = next((n for n in folder.notes if n.id == note_id), None)
+        note = folder.get_note_by_id(note_id)
         if not note:
             return False
         
@@ -724,6 +907,7 @@ class DataManager:
         # The UI sorts by (Pinned, Priority, Order). DataManager must match this
         # to ensure the 'new_position' index is applied to the correct sequence.
         folder.notes.sort(key=Note.sort_key)
+        folder.invalidate_sort() # Ties in sort_key follow list order
         
         # Clamp position to valid range
         new_position = max(0, min(new_position, len(folder.notes) - 1))
@@ -740,6 +924,7 @@ class DataManager:
         
         # Insert at new position
         folder.notes.insert(new_position, note)
+        folder.invalidate_sort()
         
         # Capture old orders to minimize IO
         old_orders = {n.id: n.order for n in folder.notes}
@@ -764,6 +949,7 @@ class DataManager:
         
         # Insert at position
         folder.notes.insert(position, note)
+        folder.invalidate_sort()
         
         # Normalize order
         self._normalize_note_order(folder)
@@ -805,7 +991,7 @@ class DataManager:
         if not self.notebooks and not self.get_setting("notebooks_initialized", False):
             default_nb = self.add_notebook("Personal Notebook")
             # Put all non-archived folders in it
-            default_nb.folder_ids = [f.id for f in self.folders if not getattr(f, 'is_archived', False)]
+            default_nb.folder_ids = [f.id for f in self.folders if not f.is_archived]
             self.settings["notebooks_initialized"] = True 
             self.save_settings()
         else:
@@ -906,7 +1092,16 @@ class DataManager:
         except Exception as e:
             print(f"Failed to save settings: {e}")
 
-    def set_setting(self, key, value):
+    def set_setting(self, key, value, save=True):
+        """Set a setting; with save=False the caller is responsible for a later save_settings()."""
         self.settings[key] = value
-        self.save_settings()
+        if save:
+            self.save_settings()
+
+    def request_settings_save(self):
+        """Save settings soon: through `settings_save_scheduler` when one is installed, else now."""
+        if self.settings_save_scheduler is not None:
+            self.settings_save_scheduler()
+        else:
+            self.save_settings()
 
@@ -0,0 +1,158 @@
+import os
+import shutil
+import unittest
+import sys
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from storage.data_manager import DataManager, TRASH_DIR
+from config import NOTES_DIR
+from models.folder import Folder
+from models.note import Note
+
+FOLDER_IDS = ["test_cache_a", "test_cache_b", "test_cache_renamed"]
+
+class TestDataManagerCaches(unittest.TestCase):
+    def setUp(self):
+        self.dm = DataManager()
+        self._cleanup()
+        self.a = self.dm.add_folder("test_cache_a")
+        self.b = self.dm.add_folder("test_cache_b")
+        self.note = self._add_note(self.a, "test_cache_n1", "2099-01-01T00:00:00")
+
+    def tearDown(self):
+        self._cleanup()
+
+    def _cleanup(self):
+        for folder_id in FOLDER_IDS:
+            path = os.path.join(NOTES_DIR, folder_id)
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            self.dm._purge_trash_for_folder(folder_id)
+        if os.path.exists(TRASH_DIR):
+            for name in os.listdir(TRASH_DIR):
+                if name.startswith("test_cache_"):
+                    os.remove(os.path.join(TRASH_DIR, name))
+
+    def _add_note(self, folder, note_id, created_at):
+        note = Note(title=note_id, note_id=note_id, created_at=created_at)
+        folder.add_note(note)
+        self.dm.save_note(folder, note)
+        return note
+
+    def _recent_ids(self):
+        return [n.id for n in self.dm.get_recent_notes() if n.id.startswith("test_cache_")]
+
+    def test_folder_index(self):
+        self.assertIs(self.dm.get_folder_by_id("test_cache_a"), self.a)
+
+        self.assertTrue(self.dm.rename_folder("test_cache_a", "test_cache_renamed"))
+        self.assertIsNone(self.dm.get_folder_by_id("test_cache_a"))
+        self.assertIs(self.dm.get_folder_by_id("test_cache_renamed"), self.a)
+
+        self.dm.delete_folder("test_cache_renamed", permanent=True)
+        self.assertIsNone(self.dm.get_folder_by_id("test_cache_renamed"))
+        self.assertIs(self.dm.get_folder_by_id("test_cache_b"), self.b)
+
+    def test_find_note_by_id(self):
+        self.assertEqual(self.dm.find_note_by_id(self.note.id), (self.a, self.note))
+
+        # Added after the index was built
+        n2 = self._add_note(self.b, "test_cache_n2", "2099-01-02T00:00:00")
+        self.assertEqual(self.dm.find_note_by_id(n2.id), (self.b, n2))
+
+        self.assertTrue(self.dm.move_note_between_folders(self.note.id, self.a, self.b))
+        self.assertEqual(self.dm.find_note_by_id(self.note.id), (self.b, self.note))
+
+        self.dm.rename_folder("test_cache_b", "test_cache_renamed")
+        self.assertEqual(self.dm.find_note_by_id(n2.id), (self.b, n2))
+
+        self.dm.delete_note(self.b, n2.id)
+        self.assertEqual(self.dm.find_note_by_id(n2.id), (None, None))
+
+    def test_recent_notes(self):
+        self.assertEqual(self._recent_ids(), ["test_cache_n1"])
+
+        n2 = self._add_note(self.b, "test_cache_n2", "2099-01-02T00:00:00")
+        self.assertEqual(self._recent_ids(), ["test_cache_n2", "test_cache_n1"])
+
+        self.note.created_at = "2099-01-03T00:00:00"
+        self.assertEqual(self._recent_ids(), ["test_cache_n1", "test_cache_n2"])
+
+        self.dm.move_note_between_folders(self.note.id, self.a, self.b)
+        recent = [n for n in self.dm.get_recent_notes() if n.id == self.note.id]
+        self.assertIs(recent[0]._parent_folder, self.b)
+
+        self.dm.hide_note_from_recent(n2.id)
+        self.assertEqual(self._recent_ids(), ["test_cache_n1"])
+
+        self.dm.delete_note(self.b, self.note.id)
+        self.assertEqual(self._recent_ids(), [])
+
+    def test_recent_notes_list_replaced_with_same_length(self):
+        n2 = self._add_note(self.a, "test_cache_n2", "2099-01-02T00:00:00")
+        self.assertEqual(self._recent_ids(), ["test_cache_n2", "test_cache_n1"])
+
+        n3 = Note(title="n3", note_id="test_cache_n3", created_at="2099-01-03T00:00:00")
+        self.a.notes = [self.note, n3]
+        self.assertEqual(self._recent_ids(), ["test_cache_n3", "test_cache_n1"])
+
+    def test_aggregate_lists(self):
+        active = [n.id for n in self.dm.get_all_active_notes_sorted()]
+        self.assertIn(self.note.id, active)
+
+        self.a.is_archived = True
+        self.assertNotIn(self.note.id, [n.id for n in self.dm.get_all_active_notes_sorted()])
+        self.assertIn(self.note.id, [n.id for n in self.dm.get_archived_folder_notes()])
+
+        self.a.remove_note(self.note.id)
+        self.assertNotIn(self.note.id, [n.id for n in self.dm.get_archived_folder_notes()])
+
+    def test_aggregate_folder_replaced_under_same_id(self):
+        self.assertIn(self.note.id, [n.id for n in self.dm.get_all_active_notes_sorted()])
+
+        # A reload builds a new Folder with the same id; its version must not repeat the old one's
+        n2 = Note(title="n2", note_id="test_cache_n2", created_at="2099-01-02T00:00:00")
+        self.dm.folders[self.dm.folders.index(self.a)] = Folder("test_cache_a", folder_id="test_cache_a", notes=[n2])
+        active = [n.id for n in self.dm.get_all_active_notes_sorted()]
+        self.assertIn(n2.id, active)
+        self.assertNotIn(self.note.id, active)
+
+    def test_trash_listing(self):
+        def trashed_ids():
+            return [n.id for n in self.dm.get_trash_notes(include_folders=False)]
+
+        self.assertNotIn(self.note.id, trashed_ids())
+        self.dm.delete_note(self.a, self.note.id)
+        self.assertIn(self.note.id, trashed_ids())
+
+        trash_path = next(n._trash_path for n in self.dm.get_trash_notes(include_folders=False)
+                          if n.id == self.note.id)
+        self.dm.permanent_delete_item(trash_path)
+        self.assertNotIn(self.note.id, trashed_ids())
+
+class TestFolderNotePositions(unittest.TestCase):
+    def setUp(self):
+        self.notes = [Note(title=f"n{i}", note_id=f"n{i}") for i in range(3)]
+        self.folder = Folder(name="Positions", notes=list(self.notes))
+
+    def test_lookup_after_changes(self):
+        self.assertIs(self.folder.get_note_by_id("n1"), self.notes[1])
+
+        self.folder.remove_note("n0")
+        self.assertIs(self.folder.get_note_by_id("n1"), self.notes[1])
+        self.assertIsNone(self.folder.get_note_by_id("n0"))
+
+        # Edited in place, bypassing add_note()
+        new = Note(title="new", note_id="new")
+        self.folder.notes.insert(0, new)
+        self.assertIs(self.folder.get_note_by_id("new"), new)
+        self.assertIs(self.folder.get_note_by_id("n2"), self.notes[2])
+
+        self.folder.notes = [self.notes[0]]
+        self.assertIs(self.folder.get_note_by_id("n0"), self.notes[0])
+        self.assertIsNone(self.folder.get_note_by_id("n2"))
+
+if __name__ == '__main__':
+    unittest.main()
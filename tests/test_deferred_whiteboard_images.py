@@ -0,0 +1,103 @@
+import os
+import shutil
+import json
+import unittest
+import sys
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from storage.data_manager import DataManager, TRASH_DIR
+from config import NOTES_DIR
+from models.note import Note
+
+FOLDER_IDS = ["test_deferred_a", "test_deferred_b", "test_deferred_renamed"]
+IMAGES = {"wb_1.png": "aGVsbG8=", "wb_2.png": "d29ybGQ="}
+
+class TestNoteDeferredImages(unittest.TestCase):
+    def test_loader_runs_once_on_first_access(self):
+        calls = []
+        note = Note(title="n", whiteboard_images=dict(IMAGES))
+        note.defer_whiteboard_images(lambda: calls.append(1) or dict(IMAGES))
+        self.assertEqual(calls, [])
+        self.assertEqual(note.whiteboard_images, IMAGES)
+        self.assertEqual(note.whiteboard_images, IMAGES)
+        self.assertEqual(calls, [1])
+
+    def test_assignment_replaces_pending_load(self):
+        note = Note(title="n")
+        note.defer_whiteboard_images(lambda: self.fail("loader should not run"))
+        note.whiteboard_images = {"new.png": "eA=="}
+        self.assertEqual(note.whiteboard_images, {"new.png": "eA=="})
+
+    def test_to_dict_loads_deferred_images(self):
+        note = Note(title="n")
+        note.defer_whiteboard_images(lambda: dict(IMAGES))
+        self.assertEqual(note.to_dict()["whiteboard_images"], IMAGES)
+
+class TestDataManagerDeferredImages(unittest.TestCase):
+    def setUp(self):
+        dm = DataManager()
+        self._cleanup(dm)
+        a = dm.add_folder("test_deferred_a")
+        dm.add_folder("test_deferred_b")
+        note = Note(title="Drawing", content="<p>x</p>", note_id="test_deferred_note",
+                    whiteboard_images=dict(IMAGES))
+        a.add_note(note)
+        dm.save_note(a, note)
+        # A fresh load defers the image payload
+        self.dm = DataManager()
+        self.a = self.dm.get_folder_by_id("test_deferred_a")
+        self.b = self.dm.get_folder_by_id("test_deferred_b")
+        self.note = self.a.get_note_by_id("test_deferred_note")
+
+    def tearDown(self):
+        self._cleanup(self.dm)
+
+    def _cleanup(self, dm):
+        for folder_id in FOLDER_IDS:
+            path = os.path.join(NOTES_DIR, folder_id)
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            dm._purge_trash_for_folder(folder_id)
+        if os.path.exists(TRASH_DIR):
+            for name in os.listdir(TRASH_DIR):
+                if name.startswith("test_deferred_note"):
+                    os.remove(os.path.join(TRASH_DIR, name))
+
+    def _file_images(self, folder_id):
+        with open(os.path.join(NOTES_DIR, folder_id, "test_deferred_note.json"), encoding='utf-8') as f:
+            return json.load(f)["whiteboard_images"]
+
+    def test_load_defers_images(self):
+        self.assertIsNotNone(self.note._whiteboard_loader)
+        self.assertEqual(self.note.whiteboard_images, IMAGES)
+        self.assertIsNone(self.note._whiteboard_loader)
+
+    def test_save_keeps_unloaded_images(self):
+        self.note.title = "Renamed"
+        self.dm.save_note(self.a, self.note)
+        self.assertEqual(self._file_images("test_deferred_a"), IMAGES)
+
+        path = self.dm.stage_note_write(self.a, self.note)
+        self.dm.write_staged_note(path)
+        self.assertEqual(self._file_images("test_deferred_a"), IMAGES)
+
+    def test_images_follow_moved_note(self):
+        self.assertTrue(self.dm.move_note_between_folders(self.note.id, self.a, self.b))
+        self.assertIsNotNone(self.note._whiteboard_loader)
+        self.assertEqual(self.note.whiteboard_images, IMAGES)
+
+    def test_images_follow_renamed_folder(self):
+        self.assertTrue(self.dm.rename_folder("test_deferred_a", "test_deferred_renamed"))
+        self.assertEqual(self.note.whiteboard_images, IMAGES)
+
+    def test_trashed_note_keeps_images(self):
+        self.dm.delete_note(self.a, self.note.id)
+        trashed = [n for n in os.listdir(TRASH_DIR) if n.startswith("test_deferred_note")]
+        self.assertEqual(len(trashed), 1)
+        with open(os.path.join(TRASH_DIR, trashed[0]), encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["whiteboard_images"], IMAGES)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import unittest
+import sys
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.folder import Folder
+from models.note import Note
+
+class TestFolderSortCache(unittest.TestCase):
+    def setUp(self):
+        self.notes = [Note(title=f"n{i}", note_id=f"n{i}", order=i) for i in range(4)]
+        self.folder = Folder(name="Sorted", notes=list(self.notes))
+
+    def ids(self):
+        return [n.id for n in self.folder.sorted_notes]
+
+    def test_cold_cache(self):
+        self.assertEqual(self.ids(), ["n0", "n1", "n2", "n3"])
+        self.assertEqual(self.folder.sort_index_of("n2"), 2)
+        self.assertIsNone(self.folder.sort_index_of("missing"))
+
+    def test_cache_reused_while_unchanged(self):
+        state = self.folder._sorted_state()
+        self.assertIs(self.folder._sorted_state(), state)
+
+    def test_pin_and_priority_changes(self):
+        self.ids() # warm the cache
+        self.notes[3].is_pinned = True
+        self.assertEqual(self.ids(), ["n3", "n0", "n1", "n2"])
+
+        self.notes[2].priority = 1
+        self.assertEqual(self.ids(), ["n3", "n2", "n0", "n1"])
+
+        self.notes[3].is_pinned = False
+        self.assertEqual(self.folder.sort_index_of("n3"), 3)
+
+    def test_reorder(self):
+        self.ids()
+        for i, n in enumerate(reversed(self.notes)):
+            n.order = i
+        self.assertEqual(self.ids(), ["n3", "n2", "n1", "n0"])
+        self.assertEqual(self.folder.sort_index_of("n0"), 3)
+
+    def test_in_place_reorder_with_equal_keys(self):
+        for n in self.notes:
+            n.order = 0
+        self.assertEqual(self.ids(), ["n0", "n1", "n2", "n3"])
+        self.folder.notes.reverse()
+        self.folder.invalidate_sort()
+        self.assertEqual(self.ids(), ["n3", "n2", "n1", "n0"])
+
+    def test_add_and_remove(self):
+        self.ids()
+        new = Note(title="new", note_id="new", order=-1)
+        self.folder.add_note(new)
+        self.assertEqual(self.folder.sort_index_of("new"), 0)
+
+        self.folder.remove_note("n0")
+        self.assertIsNone(self.folder.sort_index_of("n0"))
+        self.assertEqual(self.ids(), ["new", "n1", "n2", "n3"])
+
+        self.folder.notes = self.notes[:2]
+        self.assertEqual(self.ids(), ["n0", "n1"])
+
+    def test_newest_first_follows_created_at(self):
+        for i, n in enumerate(self.notes):
+            n.created_at = f"2024-01-0{i + 1}T00:00:00"
+        self.assertEqual([n.id for n in self.folder.notes_newest_first()], ["n3", "n2", "n1", "n0"])
+        self.notes[0].created_at = "2025-01-01T00:00:00"
+        self.assertEqual(self.folder.notes_newest_first()[0].id, "n0")
+
+if __name__ == '__main__':
+    unittest.main()
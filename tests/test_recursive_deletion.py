@@ -58,8 +58,14 @@ class TestRecursiveDeletion(unittest.TestCase):
         folder = next((f for f in self.dm.folders if f.id == self.test_folder_id), None)
         self.assertIsNotNone(folder)
         
+        # Lookups hit the in-memory indexes before the delete
+        self.assertIs(self.dm.get_folder_by_id(self.test_folder_id), folder)
+        self.assertEqual(self.dm.find_note_by_id(self.note_id)[0], folder)
+
         # Perform soft delete
         self.dm.delete_folder(self.test_folder_id, permanent=False)
+        self.assertIsNone(self.dm.get_folder_by_id(self.test_folder_id))
+        self.assertEqual(self.dm.find_note_by_id(self.note_id), (None, None))
         
         # 1. Verify filesystem movement
         self.assertFalse(os.path.exists(self.test_folder_path))
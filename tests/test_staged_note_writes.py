@@ -0,0 +1,84 @@
+import os
+import shutil
+import json
+import unittest
+import sys
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from storage.data_manager import DataManager, TRASH_DIR
+from config import NOTES_DIR
+from models.note import Note
+
+class TestStagedNoteWrites(unittest.TestCase):
+    def setUp(self):
+        self.dm = DataManager()
+        self.folder_ids = ["test_staged_src", "test_staged_dst", "test_staged_renamed"]
+        self._cleanup()
+        self.src = self.dm.add_folder("test_staged_src")
+        self.dst = self.dm.add_folder("test_staged_dst")
+        self.note = Note(title="Staged", content="v1", note_id="test_staged_note")
+        self.src.add_note(self.note)
+        self.dm.save_note(self.src, self.note)
+        self.src_path = os.path.join(NOTES_DIR, "test_staged_src", "test_staged_note.json")
+
+    def tearDown(self):
+        self._cleanup()
+
+    def _cleanup(self):
+        for folder_id in self.folder_ids:
+            path = os.path.join(NOTES_DIR, folder_id)
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            self.dm._purge_trash_for_folder(folder_id)
+        if os.path.exists(TRASH_DIR):
+            for name in os.listdir(TRASH_DIR):
+                if name.startswith("test_staged_note"):
+                    os.remove(os.path.join(TRASH_DIR, name))
+
+    def _stage_edit(self, folder):
+        self.note.content = "v2"
+        return self.dm.stage_note_write(folder, self.note)
+
+    def test_delete_drops_staged_write(self):
+        n_path = self._stage_edit(self.src)
+        self.dm.delete_note(self.src, self.note.id)
+        self.assertFalse(os.path.exists(self.src_path))
+
+        # A write task queued before the delete must not bring the note back
+        self.dm.write_staged_note(n_path)
+        self.assertFalse(os.path.exists(self.src_path))
+
+        trashed = [n for n in os.listdir(TRASH_DIR) if n.startswith("test_staged_note")]
+        self.assertEqual(len(trashed), 1)
+
+    def test_move_carries_staged_write(self):
+        n_path = self._stage_edit(self.src)
+        self.assertTrue(self.dm.move_note_between_folders(self.note.id, self.src, self.dst))
+
+        self.dm.write_staged_note(n_path)
+        self.assertFalse(os.path.exists(self.src_path))
+        dst_path = os.path.join(NOTES_DIR, "test_staged_dst", "test_staged_note.json")
+        with open(dst_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["content"], "v2")
+
+    def test_rename_folder_carries_staged_write(self):
+        n_path = self._stage_edit(self.src)
+        self.assertTrue(self.dm.rename_folder(self.src.id, "test_staged_renamed"))
+
+        self.dm.write_staged_note(n_path)
+        self.assertFalse(os.path.exists(os.path.dirname(self.src_path)))
+        new_path = os.path.join(NOTES_DIR, "test_staged_renamed", "test_staged_note.json")
+        with open(new_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["content"], "v2")
+
+    def test_delete_folder_drops_staged_write(self):
+        n_path = self._stage_edit(self.src)
+        self.dm.delete_folder(self.src.id, permanent=True)
+
+        self.dm.write_staged_note(n_path)
+        self.assertFalse(os.path.exists(os.path.dirname(self.src_path)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2348,7 +2348,8 @@ class TextEditor(QWidget):
         
         # Save persistence
         if self.data_manager:
-            self.data_manager.set_setting("editor_font_family", family)
+            self.data_manager.set_setting("editor_font_family", family, save=False)
+            self.data_manager.request_settings_save()
             
         self.editor.setFocus()
 
@@ -2567,7 +2568,8 @@ class TextEditor(QWidget):
         
         # PERSISTENCE: Save last set font size
         if self.data_manager:
-            self.data_manager.set_setting("editor_font_size", size)
+            self.data_manager.set_setting("editor_font_size", size, save=False)
+            self.data_manager.request_settings_save()
             
         self.editor.setFocus() # Return focus to editor
         
@@ -1,15 +1,112 @@
 from PyQt6.QtWidgets import (
-    QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
+    QHBoxLayout, QLabel, QLineEdit, 
     QTreeWidget, QTreeWidgetItem, QPushButton, 
-    QWidget, QFrame, QTabWidget, QCheckBox
+    QTabWidget, QCheckBox
 )
-from datetime import datetime
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QIcon, QFont, QColor
+from PyQt6.QtCore import Qt, QSize, QSignalBlocker
 from util.icon_factory import get_premium_icon
 import ui.styles as styles
 from ui.zen_dialog import ZenDialog
 
+_STYLE_CACHE = {} # theme_mode -> stylesheets from _build_stylesheets
+
+def _build_stylesheets(theme_mode):
+    """Return (search, tree, tabs, link button, cancel button) stylesheets for a theme."""
+    c = styles.ZEN_THEME.get(theme_mode, styles.ZEN_THEME["light"])
+
+    search_style = f"""
+        QLineEdit {{
+            background-color: {c['secondary']};
+            color: {c['foreground']};
+            border: 1px solid {c['border']};
+            border-radius: 8px;
+            padding: 10px;
+            font-size: 14px;
+        }}
+        QLineEdit:focus {{
+            border-color: {c['primary']};
+        }}
+    """
+    
+    tree_style = f"""
+        QTreeWidget {{
+            background-color: {c['background']};
+            color: {c['foreground']};
+            border: 1px solid {c['border']};
+            border-radius: 8px;
+            font-size: 14px;
+            outline: none;
+            padding: 5px;
+        }}
+        QTreeWidget::item {{
+            padding: 6px;
+            border-radius: 4px;
+        }}
+        QTreeWidget::item:hover {{
+            background-color: {c['muted']};
+        }}
+        QTreeWidget::item:selected {{
+            background-color: {c['active_item_bg']};
+            color: {c['primary']}; 
+            font-weight: bold;
+        }}
+    """
+
+    tabs_style = f"""
+        QTabWidget::pane {{
+            border: 1px solid {c['border']};
+            border-radius: 8px;
+            top: -1px; 
+        }}
+        QTabBar::tab {{
+            background: {c['secondary']};
+            border: 1px solid {c['border']};
+            padding: 8px 16px;
+            margin-right: 2px;
+            border-top-left-radius: 6px;
+            border-top-right-radius: 6px;
+            color: {c['muted_foreground']};
+        }}
+        QTabBar::tab:selected {{
+            background: {c['background']};
+            border-bottom-color: {c['background']};
+            color: {c['foreground']};
+            font-weight: bold;
+        }}
+    """
+    
+    btn_base = f"""
+        QPushButton {{
+            padding: 8px 20px;
+            border-radius: 8px;
+            font-weight: bold;
+            font-size: 13px;
+        }}
+    """
+    link_style = btn_base + f"""
+        QPushButton {{
+            background-color: {c['primary']};
+            color: {c['primary_foreground']};
+            border: none;
+        }}
+        QPushButton:hover {{ opacity: 0.9; }}
+        QPushButton:disabled {{
+            background-color: {c['muted']};
+            color: {c['muted_foreground']};
+        }}
+    """
+    
+    cancel_style = btn_base + f"""
+        QPushButton {{
+            background-color: transparent;
+            color: {c['foreground']};
+            border: 1px solid {c['border']};
+        }}
+        QPushButton:hover {{ background-color: {c['muted']}; }}
+    """
+    return (search_style, tree_style, tabs_style, link_style, cancel_style)
+
+
 class LinkNoteDialog(ZenDialog):
     """Dialog to search and select a note to link to, grouped by folder."""
     
@@ -27,6 +124,11 @@ class LinkNoteDialog(ZenDialog):
         self.selected_note_id = None
         self.selected_note_title = None
         self.open_in_overlay = False
+        self._archived_folders = []
+        self._archive_loaded = False
+        # tree -> [(folder_item, folder_text, chars, [(note_item, title), ...]), ...]
+        # Lower-cased texts and the set of characters they contain, recorded while populating
+        self._filter_rows = {}
         
         self.setMinimumWidth(650)
         self.setMinimumHeight(600)
@@ -60,6 +162,7 @@ class LinkNoteDialog(ZenDialog):
         # Archive Tree
         self.archive_tree = self._create_tree()
         self.tabs.addTab(self.archive_tree, "Archived")
+        self.tabs.currentChanged.connect(self._on_tab_changed)
         
         # Options
         self.cb_overlay = QCheckBox("Open in Overlay")
@@ -90,30 +193,35 @@ class LinkNoteDialog(ZenDialog):
         tree.setHeaderHidden(True)
         tree.setSelectionMode(QTreeWidget.SelectionMode.SingleSelection)
         tree.setIndentation(20)
+        # Folder and note rows share one icon size and font, so Qt can skip per-row measuring
+        tree.setUniformRowHeights(True)
+        tree.setAnimated(False)
         tree.itemDoubleClicked.connect(self._on_item_double_clicked)
-        tree.itemSelectionChanged.connect(lambda: self._on_selection_changed(tree))
+        tree.itemSelectionChanged.connect(self._on_selection_changed_slot)
         return tree
 
     def _load_notes(self):
+        # Bulk (re)population: silence selection signals until the trees are built
+        with QSignalBlocker(self.active_tree), QSignalBlocker(self.archive_tree):
+            self._populate_trees()
+
+    def _populate_trees(self):
         self.active_tree.clear()
         self.archive_tree.clear()
+        self._filter_rows.clear()
         
         if not self.data_manager:
             return
             
-        active_folders = [f for f in self.data_manager.folders if not getattr(f, 'is_archived', False)]
-        archived_folders = [f for f in self.data_manager.folders if getattr(f, 'is_archived', False)]
+        active_folders, archived_folders = [], []
+        for f in self.data_manager.folders:
+            (archived_folders if getattr(f, 'is_archived', False) else active_folders).append(f)
         
         def sidebar_sort_key(f):
             pinned_rank = not f.is_pinned
             prio = f.priority if f.priority > 0 else 999
             order_rank = getattr(f, 'order', 0)
-            try:
-                dt = datetime.fromisoformat(f.created_at)
-                timestamp = dt.timestamp()
-            except Exception:
-                timestamp = 0
-            date_rank = -timestamp 
+            date_rank = -f.created_timestamp
             return (pinned_rank, prio, order_rank, date_rank)
 
         active_folders.sort(key=sidebar_sort_key)
@@ -122,11 +230,35 @@ class LinkNoteDialog(ZenDialog):
         for i, folder in enumerate(active_folders, 1):
             self._add_folder_item(folder, self.active_tree.invisibleRootItem(), index_prefix=i)
             
-        for folder in archived_folders:
-            self._add_folder_item(folder, self.archive_tree.invisibleRootItem(), is_archived=True)
+        # Archive tree is built on first visit to its tab (see _on_tab_changed)
+        self._archived_folders = archived_folders
+        self._archive_loaded = False
+        if self.tabs.currentWidget() is self.archive_tree:
+            self._populate_archive()
+
+    def _populate_archive(self):
+        self._archive_loaded = True
+        with QSignalBlocker(self.archive_tree):
+            for folder in self._archived_folders:
+                self._add_folder_item(folder, self.archive_tree.invisibleRootItem(), is_archived=True)
+
+    def _on_tab_changed(self, index):
+        if self._archive_loaded or self.tabs.widget(index) is not self.archive_tree:
+            return
+        self._populate_archive()
+        # Bring the freshly built tree in line with the current search
+        if self.search_input.text().strip():
+            self._filter_notes(self.search_input.text())
 
     def _add_folder_item(self, folder, parent_item, is_archived=False, index_prefix=None):
-        valid_notes = [n for n in folder.notes if n.id != self.current_note_id]
+        if self.current_note_id is None:
+            valid_notes = folder.notes
+        else:
+            valid_notes = [n for n in folder.notes if n.id != self.current_note_id]
+        if not valid_notes:
+            # Nothing linkable here; don't add an empty folder node
+            return
+
         display_name = folder.name
         if index_prefix is not None:
              display_name = f"{index_prefix}. {folder.name}"
@@ -141,40 +273,50 @@ class LinkNoteDialog(ZenDialog):
         folder_item.setFlags(Qt.ItemFlag.ItemIsEnabled)
         folder_item.setExpanded(False)
         
+        folder_text = display_name.lower()
+        chars = set(folder_text)
+        note_rows = []
         for note in valid_notes:
+            title = note.title.lower()
+            chars.update(title)
             note_item = QTreeWidgetItem(folder_item)
             note_item.setText(0, note.title)
             note_item.setIcon(0, get_premium_icon("note"))
             note_item.setData(0, Qt.ItemDataRole.UserRole, note.id)
             note_item.setData(0, Qt.ItemDataRole.UserRole + 1, note.title)
+            note_rows.append((note_item, title))
+        self._filter_rows.setdefault(folder_item.treeWidget(), []).append(
+            (folder_item, folder_text, chars, note_rows))
 
     def _filter_notes(self, text):
         text = text.lower().strip()
         
         def filter_tree(tree):
-            def check_item(item):
+            # Flat sweep over the rows recorded by _add_folder_item; no Qt tree traversal
+            for folder_item, folder_text, chars, note_rows in self._filter_rows.get(tree, ()):
+                if text and not chars.issuperset(text):
+                    # No title in this folder can contain the query; skip its notes
+                    folder_item.setHidden(True)
+                    continue
+
                 has_visible_child = False
-                item_text = item.text(0).lower()
-                for i in range(item.childCount()):
-                    if check_item(item.child(i)):
-                        has_visible_child = True
-                
-                item_type = item.data(0, Qt.ItemDataRole.UserRole)
-                is_folder = (item_type == "FOLDER")
-                matches = text in item_text
-                should_show = True if not text else (matches or has_visible_child if is_folder else matches)
-                
-                item.setHidden(not should_show)
-                if should_show and text:
-                    item.setExpanded(True)
-                return should_show
+                for note_item, title in note_rows:
+                    matches = not text or text in title
+                    note_item.setHidden(not matches)
+                    has_visible_child = has_visible_child or matches
 
-            root = tree.invisibleRootItem()
-            for i in range(root.childCount()):
-                check_item(root.child(i))
+                should_show = not text or has_visible_child or text in folder_text
+                folder_item.setHidden(not should_show)
+                if should_show and text:
+                    folder_item.setExpanded(True)
 
         filter_tree(self.active_tree)
-        filter_tree(self.archive_tree)
+        if self._archive_loaded:
+            filter_tree(self.archive_tree)
+
+    def _on_selection_changed_slot(self):
+        # Shared by both trees; the emitting tree is the sender
+        self._on_selection_changed(self.sender())
 
     def _on_selection_changed(self, tree):
         if tree == self.active_tree:
@@ -213,97 +355,14 @@ class LinkNoteDialog(ZenDialog):
         self.accept()
 
     def _apply_theme_local(self):
-        c = styles.ZEN_THEME.get(self.theme_mode, styles.ZEN_THEME["light"])
-            
-        self.search_input.setStyleSheet(f"""
-            QLineEdit {{
-                background-color: {c['secondary']};
-                color: {c['foreground']};
-                border: 1px solid {c['border']};
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 14px;
-            }}
-            QLineEdit:focus {{
-                border-color: {c['primary']};
-            }}
-        """)
-        
-        tree_style = f"""
-            QTreeWidget {{
-                background-color: {c['background']};
-                color: {c['foreground']};
-                border: 1px solid {c['border']};
-                border-radius: 8px;
-                font-size: 14px;
-                outline: none;
-                padding: 5px;
-            }}
-            QTreeWidget::item {{
-                padding: 6px;
-                border-radius: 4px;
-            }}
-            QTreeWidget::item:hover {{
-                background-color: {c['muted']};
-            }}
-            QTreeWidget::item:selected {{
-                background-color: {c['active_item_bg']};
-                color: {c['primary']}; 
-                font-weight: bold;
-            }}
-        """
+        sheets = _STYLE_CACHE.get(self.theme_mode)
+        if sheets is None:
+            sheets = _STYLE_CACHE[self.theme_mode] = _build_stylesheets(self.theme_mode)
+        search_style, tree_style, tabs_style, link_style, cancel_style = sheets
+
+        self.search_input.setStyleSheet(search_style)
         self.active_tree.setStyleSheet(tree_style)
         self.archive_tree.setStyleSheet(tree_style)
-
-        self.tabs.setStyleSheet(f"""
-            QTabWidget::pane {{
-                border: 1px solid {c['border']};
-                border-radius: 8px;
-                top: -1px; 
-            }}
-            QTabBar::tab {{
-                background: {c['secondary']};
-                border: 1px solid {c['border']};
-                padding: 8px 16px;
-                margin-right: 2px;
-                border-top-left-radius: 6px;
-                border-top-right-radius: 6px;
-                color: {c['muted_foreground']};
-            }}
-            QTabBar::tab:selected {{
-                background: {c['background']};
-                border-bottom-color: {c['background']};
-                color: {c['foreground']};
-                font-weight: bold;
-            }}
-        """)
-        
-        btn_base = f"""
-            QPushButton {{
-                padding: 8px 20px;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 13px;
-            }}
-        """
-        self.btn_link.setStyleSheet(btn_base + f"""
-            QPushButton {{
-                background-color: {c['primary']};
-                color: {c['primary_foreground']};
-                border: none;
-            }}
-            QPushButton:hover {{ opacity: 0.9; }}
-            QPushButton:disabled {{
-                background-color: {c['muted']};
-                color: {c['muted_foreground']};
-            }}
-        """)
-        
-        self.btn_cancel.setStyleSheet(btn_base + f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {c['foreground']};
-                border: 1px solid {c['border']};
-            }}
-            QPushButton:hover {{ background-color: {c['muted']}; }}
-        """)
+        self.tabs.setStyleSheet(tabs_style)
+        self.btn_link.setStyleSheet(link_style)
+        self.btn_cancel.setStyleSheet(cancel_style)
@@ -6,7 +6,7 @@ from PyQt6.QtWidgets import (
     QAbstractItemView, QStyleFactory, QListWidgetItem, QToolButton, QStyle, QButtonGroup, QRadioButton, QTextBrowser, QFrame,
     QStackedWidget
 )
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QProcess, QPoint, QRectF, QPointF, QRect
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QProcess, QPoint, QRectF, QPointF, QRect, QPropertyAnimation, QEasingCurve, QSignalBlocker, QRunnable, QThreadPool, QObject
 from PyQt6.QtGui import QAction, QIcon, QKeySequence, QShortcut, QPainter, QPen, QColor, QPixmap, QImage, QMouseEvent, QPaintEvent, QTextCursor
 from util.icon_factory import get_premium_icon
 
@@ -14,7 +14,6 @@ from ui.sidebar import Sidebar
 from ui.note_list import NoteList
 from ui.editor import TextEditor
 from ui.widgets import EmptyStateWidget
-from ui.whiteboard_widget import WhiteboardWidget
 from storage.data_manager import DataManager
 from models.note import Note
 from models.folder import Folder
@@ -23,16 +22,241 @@ from ui.shortcut_dialog import ShortcutDialog
 from ui.move_note_dialog import MoveNoteDialog
 from util.logger import logger
 import ui.styles as styles
-# PDF Export to be imported later
+import contextlib
+import copy
+import functools
+import importlib.util
 import json
 import os
+import re
 import sys
+import threading
+import time
+from collections import ChainMap, OrderedDict
 from datetime import datetime
-from word_export import export_note_to_docx, export_folder_to_docx # NEW
+from enum import IntEnum
+from urllib.parse import quote, unquote
 from ui.note_overlay import NoteOverlayDialog
 from ui.title_bar import CustomTitleBar
 from ui.zen_dialog import ZenInputDialog, ZenItemDialog
-from ui.animations import animate_splitter, crossfade_theme, fade_widget
+
+def _lazy_import(name):
+    """Module `name`, executed only on first attribute access (keeps exporters off the startup path)."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+pdf_exporter = _lazy_import("pdf_export.exporter")
+whiteboard_exporter = _lazy_import("pdf_export.export_whiteboard")
+word_exporter = _lazy_import("word_export")
+
+# Rendered PDF previews kept for reopening unchanged folders; each can hold large inline images
+PREVIEW_CACHE_SIZE = 2
+
+# Highlight extraction patterns
+_HL_ID_RE = re.compile(r"(?:'|\"| |^)(hl_[a-f0-9]{8,}|ul_[a-f0-9]{8,})(?:'|\"|;|$)")
+_HL_BG_RE = re.compile(r'background(?:-color)?:\s*([^;"]+)')
+_HL_MARGIN_RE = re.compile(r'margin-left:\s*(\d+)px')
+_HL_ATTR_STRIP_RE = re.compile(r'''\s*(?:style="[^"]*"|style='[^']*'|class="[^"]*")''')
+
+# Highlight colors recognized in strict mode, besides the user's custom one (lowercase)
+_HL_KNOWN_COLORS = frozenset({
+    "#ffff00", "yellow", # Standard Yellow
+    "#00ffff", "cyan",   # Standard Cyan
+    "#00ff00", "lime",   # Green
+    "#ff00ff", "magenta",# Pink/Magenta
+    "#ff0000", "red",    # Red
+    "#ffa500", "orange", # Orange
+    "#b0b000",           # Dark Mode Gold
+})
+
+_COLOR_CACHE = {} # raw CSS color -> normalized form, see _normalize_color()
+
+def _normalize_color(c):
+    """Lowercase #rrggbb for any color QColor understands, else the lowercased input."""
+    norm = _COLOR_CACHE.get(c)
+    if norm is None:
+        try:
+            col = QColor(c)
+            norm = col.name().lower() if col.isValid() else str(c).lower()
+        except Exception:
+            norm = str(c).lower()
+        if len(_COLOR_CACHE) >= 1024: # Notes can carry arbitrary colors; keep this bounded
+            _COLOR_CACHE.clear()
+        _COLOR_CACHE[c] = norm
+    return norm
+
+# Notes whose parsed highlights are kept between highlight preview refreshes
+HIGHLIGHT_CACHE_SIZE = 500
+
+# Seconds a verified last_export_dir is trusted before it is stat'ed again
+EXPORT_DIR_CHECK_TTL = 30
+
+# Anything but letters, digits, spaces and dots (\w also admits "_", which is dropped too)
+_FILENAME_UNSAFE_RE = re.compile(r"[^\w .]|_")
+
+# First extension in a file dialog filter such as "PDF Files (*.pdf)"
+_FILTER_SUFFIX_RE = re.compile(r"\*\.(\w+)")
+
+def _sanitize_filename(name):
+    """Strip characters that are unsafe in export file names."""
+    return _FILENAME_UNSAFE_RE.sub("", name).rstrip()
+
+class ExportTheme(IntEnum):
+    """Built-in export themes as the exporters take them; custom ones are "#RRGGBB" strings."""
+    LIGHT = 0
+    DARK = 1
+    SEPIA = 2
+    # Theme picker choices only; resolved to "#RRGGBB" before reaching an exporter
+    CUSTOM = 3
+    CURRENT_BACKGROUND = 4
+
+_EXPORT_THEME_NAMES = {ExportTheme.LIGHT: "Light", ExportTheme.DARK: "Dark", ExportTheme.SEPIA: "Sepia"}
+
+def _export_theme_name(theme_choice):
+    if isinstance(theme_choice, int):
+        return _EXPORT_THEME_NAMES[ExportTheme(theme_choice)]
+    return f"Custom ({theme_choice})"
+
+@functools.lru_cache(maxsize=1)
+def _default_export_dir():
+    return os.path.expanduser("~/Documents")
+
+def _count_words(text):
+    # Called per text block, so str.split()'s C loop beats a regex scan; the short list is cheap
+    return len(text.split())
+
+# qdarktheme base mode for every built-in theme; custom themes are resolved on demand
+_BASE_MODE_BY_THEME = {name: "dark" if styles.is_dark_theme(name) else "light" for name in styles.ZEN_THEME}
+
+@functools.lru_cache(maxsize=16)
+def _compute_stylesheet(mode, base_mode):
+    """Combined qdarktheme base + Zen stylesheet for a theme mode."""
+    css = styles.get_stylesheet(mode)
+    qdarktheme = MainWindow._qdarktheme
+    if qdarktheme is not None and hasattr(qdarktheme, 'load_stylesheet'):
+        return qdarktheme.load_stylesheet(base_mode) + css
+    return css
+
+# Frameless-resize edge bits, as returned by MainWindow._get_edges()
+_EDGE_LEFT, _EDGE_RIGHT, _EDGE_TOP, _EDGE_BOTTOM = 1, 2, 4, 8
+_CURSOR_ARROW = Qt.CursorShape.ArrowCursor # Bound once; set on every interior mouse move
+
+def _cursor_for_edges(mask):
+    if mask in (_EDGE_BOTTOM | _EDGE_RIGHT, _EDGE_TOP | _EDGE_LEFT):
+        return Qt.CursorShape.SizeBDiagCursor
+    if mask in (_EDGE_TOP | _EDGE_RIGHT, _EDGE_BOTTOM | _EDGE_LEFT):
+        return Qt.CursorShape.SizeFDiagCursor
+    if mask & (_EDGE_LEFT | _EDGE_RIGHT):
+        return Qt.CursorShape.SizeHorCursor
+    if mask & (_EDGE_TOP | _EDGE_BOTTOM):
+        return Qt.CursorShape.SizeVerCursor
+    return _CURSOR_ARROW
+
+# Every possible edge mask -> resize cursor, so mouse moves do a single dict lookup
+_EDGE_CURSORS = {mask: _cursor_for_edges(mask) for mask in range(16)}
+
+def _qt_edges_for(mask):
+    edges = Qt.Edge(0)
+    for bit, edge in ((_EDGE_LEFT, Qt.Edge.LeftEdge), (_EDGE_RIGHT, Qt.Edge.RightEdge),
+                      (_EDGE_TOP, Qt.Edge.TopEdge), (_EDGE_BOTTOM, Qt.Edge.BottomEdge)):
+        if mask & bit:
+            edges |= edge
+    return edges
+
+class NoteWriteTask(QRunnable):
+    """Writes a note staged by DataManager.stage_note_write() off the GUI thread."""
+
+    def __init__(self, data_manager, note_path):
+        super().__init__()
+        self.data_manager = data_manager
+        self.note_path = note_path
+        self.setAutoDelete(True)
+
+    def run(self):
+        self.data_manager.write_staged_note(self.note_path)
+
+
+def _export_snapshot(target):
+    """
+    Detached copy of a Note or Folder for an export on the thread pool. Built on the
+    GUI thread, with whiteboard images already loaded, so the worker never touches the
+    live models (or DataManager's indexes) while the UI keeps editing them.
+    """
+    if isinstance(target, Folder):
+        snapshot = copy.copy(target)
+        snapshot.notes = [_export_snapshot(n) for n in target.notes]
+        snapshot._note_positions = {}
+        return snapshot
+    snapshot = copy.copy(target)
+    # Resolved on the copy: the live note keeps its images deferred
+    snapshot.whiteboard_images = dict(snapshot.whiteboard_images)
+    return snapshot
+
+
+class ExportCancelled(Exception):
+    """Raised from an export's progress callback to stop it once the user cancels."""
+
+
+class ExportTaskSignals(QObject):
+    progress = pyqtSignal(int, int)  # current, total
+    finished = pyqtSignal(object)    # exporter return value
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class ExportTask(QRunnable):
+    """
+    Runs a PDF/Word exporter on the thread pool. The exporter's progress callback is
+    routed through queued signals, so widgets are only touched on the GUI thread.
+    """
+
+    def __init__(self, export_func, *args, **kwargs):
+        super().__init__()
+        self.export_func = export_func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = ExportTaskSignals()
+        self._cancel_event = threading.Event()
+        self._last_step = None # (total, percent) last reported
+        self.setAutoDelete(True)
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def _report_progress(self, current, total):
+        if self._cancel_event.is_set():
+            raise ExportCancelled()
+        # Exporters call back per page/note; only whole-percent steps reach the dialog
+        step = (total, current * 100 // max(total, 1))
+        if step != self._last_step or current == total:
+            self._last_step = step
+            self.signals.progress.emit(current, total)
+
+    def run(self):
+        try:
+            result = self.export_func(*self.args, progress_callback=self._report_progress, **self.kwargs)
+        except ExportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            logger.error("Export failed", exc_info=True)
+            self.signals.failed.emit(str(e))
+        else:
+            if self._cancel_event.is_set():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+
 
 class MetadataBar(QFrame):
     """Subtle bar displaying note metadata with technical typography."""
@@ -66,9 +290,7 @@ class MetadataBar(QFrame):
         layout.addStretch()
         layout.addWidget(self.lbl_modified)
         
-    def update_stats(self, text, last_modified=None, page_text=None):
-        words = len(text.split())
-        chars = len(text)
+    def update_stats(self, words=0, chars=0, last_modified=None, page_text=None):
         self.lbl_words.setText(f"{words} WORDS")
         self.lbl_chars.setText(f"{chars} CHARS")
         self.lbl_page.setText(page_text if page_text else "PAGE --/--")
@@ -79,6 +301,8 @@ class MetadataBar(QFrame):
         self.lbl_page.setText(page_text if page_text else "PAGE --/--")
 
 class MainWindow(QMainWindow):
+    _qdarktheme = None # Imported on first apply_theme()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Zen Notes")
@@ -87,18 +311,35 @@ class MainWindow(QMainWindow):
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         
-        # Default Size & Positioning
+        # Default (restore) size, then Maximize
         self.resize(1200, 800)
-        
-        # Center on screen
-        qr = self.frameGeometry()
-        cp = QApplication.primaryScreen().availableGeometry().center()
-        qr.moveCenter(cp)
-        self.move(qr.topLeft())
-        
-        # Then Maximize
         self.setWindowState(Qt.WindowState.WindowMaximized)
+        self._active_theme = None # Last mode fully applied by apply_theme()
+        self._overlays = []
+        self._confirm_dialog = None # Reused Yes/No box, built on first confirmation
+        self._theme_dialog = None # PDF theme picker, built on first export
+        self._theme_group = None
+        self._theme_default_radio = None
+        self._save_dialog = None # Export save-location dialog, built on first export
+        self._hl_cache = OrderedDict() # note_id -> (content key, highlight items), LRU
+        self._hl_cache_settings = None # (custom color, strict mode) the cached items were parsed with
+        self._highlight_view_key = None # What highlight_view currently shows, see _render_highlight_view()
+        self._highlight_view_html = None # The HTML it was last given
+        self._preview_cache = OrderedDict() # _preview_cache_key() -> rendered preview chunks, LRU
+        self._export_tasks = [] # Running ExportTasks, kept alive until they report back
+        self._export_dir_checked = (None, 0.0) # (last_export_dir, monotonic time it was seen on disk)
         self.data_manager = DataManager()
+        # Batch settings.json writes from rapid UI toggles into one flush
+        self._settings_flush_timer = QTimer(self)
+        self._settings_flush_timer.setSingleShot(True)
+        self._settings_flush_timer.setInterval(300)
+        self._settings_flush_timer.timeout.connect(self.data_manager.save_settings)
+        self.data_manager.settings_save_scheduler = self._settings_flush_timer.start
+        # Coalesce highlight preview refreshes from saves and toggles into one rebuild
+        self._hl_refresh_timer = QTimer(self)
+        self._hl_refresh_timer.setSingleShot(True)
+        self._hl_refresh_timer.setInterval(100)
+        self._hl_refresh_timer.timeout.connect(self._do_refresh_highlight_preview)
         self._custom_theme_entries = self._load_saved_custom_themes()
         raw_theme_mode = self.data_manager.get_setting("theme_mode", "light")
         if raw_theme_mode == "custom" and self._custom_theme_entries:
@@ -121,13 +362,11 @@ class MainWindow(QMainWindow):
              self.editor.requestShortcutDialog.connect(self.show_shortcut_dialog)
              
         # Sidebar Toggle Shortcut (Phase 46 Refinement)
-        from PyQt6.QtGui import QShortcut, QKeySequence
         self.toggle_shortcut = QShortcut(QKeySequence("Ctrl+B"), self)
         self.toggle_shortcut.activated.connect(self.toggle_note_panel)
         
         # Startup Animation
         self.setWindowOpacity(0.0)
-        from PyQt6.QtCore import QPropertyAnimation, QEasingCurve
         self.animation = QPropertyAnimation(self, b"windowOpacity")
         self.animation.setDuration(600)
         self.animation.setStartValue(0.0)
@@ -135,6 +374,21 @@ class MainWindow(QMainWindow):
         self.animation.setEasingCurve(QEasingCurve.Type.OutCubic)
         self.animation.start()
         
+        # Coalesce refresh requests from mutations into one rebuild per kind per event loop pass
+        self._pending_refresh = set() # "folders" / "notes"
+        self._pending_list_selection = None # (folder, note_id) for the queued note list reload
+        self._refresh_flush_timer = QTimer(self)
+        self._refresh_flush_timer.setSingleShot(True)
+        self._refresh_flush_timer.setInterval(0)
+        self._refresh_flush_timer.timeout.connect(self._flush_refresh)
+
+        # last_opened bumps from browsing notes are written in batches, not on every click
+        self._pending_meta_saves = {} # note_id -> Note
+        self._meta_save_timer = QTimer(self)
+        self._meta_save_timer.setSingleShot(True)
+        self._meta_save_timer.setInterval(5000)
+        self._meta_save_timer.timeout.connect(self._flush_note_meta_saves)
+
         # Initial Load
         # Initial Load
         self.refresh_folders()
@@ -146,7 +400,14 @@ class MainWindow(QMainWindow):
         # Window Resizing State
         self._resize_margin = 8
         self._is_resizing = False
-        self._resize_edges = Qt.Edge(0)
+        self._resize_edges = 0
+        self._last_cursor_shape = None # Avoid redundant setCursor() calls
+        self._pending_geom = None # Latest geometry requested by a resize drag
+        # Commit resize geometry once pending events drain, coalescing bursts of moves
+        self._geom_timer = QTimer(self)
+        self._geom_timer.setSingleShot(True)
+        self._geom_timer.setInterval(0)
+        self._geom_timer.timeout.connect(self._commit_pending_geometry)
         self.setMouseTracking(True) # Required for edge detection without clicking
 
     def _load_saved_custom_themes(self):
@@ -224,8 +485,13 @@ class MainWindow(QMainWindow):
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
-            edges = self._get_edges(event.pos())
+            edges = self._get_edges(event.pos(), self.width(), self.height())
             if edges:
+                # Let the window manager / compositor run the resize natively where supported
+                handle = self.windowHandle()
+                if handle is not None and handle.startSystemResize(_qt_edges_for(edges)):
+                    event.accept()
+                    return
                 self._is_resizing = True
                 self._resize_edges = edges
                 self._drag_pos = event.globalPosition().toPoint()
@@ -235,48 +501,64 @@ class MainWindow(QMainWindow):
         super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event):
-        edges = self._get_edges(event.pos())
+        pos = event.pos()
         if not self._is_resizing:
-            if edges == (Qt.Edge.BottomEdge | Qt.Edge.RightEdge): self.setCursor(Qt.CursorShape.SizeBDiagCursor)
-            elif edges == (Qt.Edge.TopEdge | Qt.Edge.LeftEdge): self.setCursor(Qt.CursorShape.SizeBDiagCursor)
-            elif edges == (Qt.Edge.TopEdge | Qt.Edge.RightEdge): self.setCursor(Qt.CursorShape.SizeFDiagCursor)
-            elif edges == (Qt.Edge.BottomEdge | Qt.Edge.LeftEdge): self.setCursor(Qt.CursorShape.SizeFDiagCursor)
-            elif edges & (Qt.Edge.LeftEdge | Qt.Edge.RightEdge): self.setCursor(Qt.CursorShape.SizeHorCursor)
-            elif edges & (Qt.Edge.TopEdge | Qt.Edge.BottomEdge): self.setCursor(Qt.CursorShape.SizeVerCursor)
-            else: self.setCursor(Qt.CursorShape.ArrowCursor)
+            # Fast path: cursor is in the window interior (the common case)
+            x, y, m = pos.x(), pos.y(), self._resize_margin
+            w, h = self.width(), self.height()
+            if m < x < w - m and m < y < h - m:
+                self._set_resize_cursor(_CURSOR_ARROW)
+                super().mouseMoveEvent(event)
+                return
+
+            self._set_resize_cursor(_EDGE_CURSORS[self._get_edges(pos, w, h)])
         else:
             new_pos = event.globalPosition().toPoint()
             diff = new_pos - self._drag_pos
             new_geom = QRect(self._start_geometry)
             
-            if self._resize_edges & Qt.Edge.LeftEdge:
+            if self._resize_edges & _EDGE_LEFT:
                 new_geom.setLeft(self._start_geometry.left() + diff.x())
-            if self._resize_edges & Qt.Edge.RightEdge:
+            if self._resize_edges & _EDGE_RIGHT:
                 new_geom.setRight(self._start_geometry.right() + diff.x())
-            if self._resize_edges & Qt.Edge.TopEdge:
+            if self._resize_edges & _EDGE_TOP:
                 new_geom.setTop(self._start_geometry.top() + diff.y())
-            if self._resize_edges & Qt.Edge.BottomEdge:
+            if self._resize_edges & _EDGE_BOTTOM:
                 new_geom.setBottom(self._start_geometry.bottom() + diff.y())
             
             # Constraints
             if new_geom.width() >= self.minimumWidth() and new_geom.height() >= self.minimumHeight():
-                self.setGeometry(new_geom)
+                # Deferred commit: moves queued behind the timer just replace the target
+                self._pending_geom = new_geom
+                if not self._geom_timer.isActive():
+                    self._geom_timer.start()
             event.accept()
             return
         super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event):
+        if self._is_resizing:
+            self._geom_timer.stop()
+            self._commit_pending_geometry()
         self._is_resizing = False
-        self.setCursor(Qt.CursorShape.ArrowCursor)
+        self._set_resize_cursor(_CURSOR_ARROW)
         super().mouseReleaseEvent(event)
 
-    def _get_edges(self, pos):
-        edges = Qt.Edge(0)
-        if pos.x() <= self._resize_margin: edges |= Qt.Edge.LeftEdge
-        if pos.x() >= self.width() - self._resize_margin: edges |= Qt.Edge.RightEdge
-        if pos.y() <= self._resize_margin: edges |= Qt.Edge.TopEdge
-        if pos.y() >= self.height() - self._resize_margin: edges |= Qt.Edge.BottomEdge
-        return edges
+    def _commit_pending_geometry(self):
+        if self._pending_geom is not None:
+            self.setGeometry(self._pending_geom)
+            self._pending_geom = None
+
+    def _set_resize_cursor(self, shape):
+        if shape != self._last_cursor_shape:
+            self._last_cursor_shape = shape
+            self.setCursor(shape)
+
+    def _get_edges(self, pos, w, h):
+        """Return the _EDGE_* bitmask of window edges within the resize margin of pos (window size w x h)."""
+        x, y, m = pos.x(), pos.y(), self._resize_margin
+        return ((x <= m) * _EDGE_LEFT | (x >= w - m) * _EDGE_RIGHT
+                | (y <= m) * _EDGE_TOP | (y >= h - m) * _EDGE_BOTTOM)
 
     def setup_ui(self):
         # 0. Initialize Title Bar Early
@@ -358,12 +640,11 @@ class MainWindow(QMainWindow):
         self.content_splitter.addWidget(self.highlight_view)
 
         # Whiteboard Widget (Hidden by default, embedded like highlight preview)
-        self.whiteboard_widget = WhiteboardWidget()
-        self.whiteboard_widget.setVisible(False)
-        self.whiteboard_widget.contentChanged.connect(lambda: self.wb_autosave_timer.start())        # Connect Whiteboard Signals
-        self.whiteboard_widget.closed.connect(self.on_whiteboard_closed)
-        self.whiteboard_widget.insert_requested.connect(self.insert_image_to_note)
-        self.content_splitter.addWidget(self.whiteboard_widget)
+        # Built on first use by _ensure_whiteboard(); a placeholder keeps the splitter slot
+        self.whiteboard_widget = None
+        self._whiteboard_placeholder = QWidget()
+        self._whiteboard_placeholder.setVisible(False)
+        self.content_splitter.addWidget(self._whiteboard_placeholder)
 
         # 4. Editor
         self.editor = TextEditor(data_manager=self.data_manager, shortcut_manager=self.shortcut_manager)
@@ -392,6 +673,7 @@ class MainWindow(QMainWindow):
         self.editor_stack = QStackedWidget()
         self.editor_stack.addWidget(self.empty_state)
         self.editor_stack.addWidget(self.editor_container)
+        self.editor_stack.currentChanged.connect(lambda _idx: self._apply_pending_theme(self.editor_stack.currentWidget()))
         
         # 7. Persistent Wrapper for Title Bar + Editor Stack
         # This ensures window controls (Min/Max/Close) stay visible in empty state.
@@ -405,10 +687,19 @@ class MainWindow(QMainWindow):
         
         self.content_splitter.addWidget(self.right_panel_container)
         
-        # Connect editor text changes to metadata updates
-        self.editor.editor.textChanged.connect(self.refresh_metadata)
+        # Connect editor text changes to metadata updates (debounced while typing)
+        self.metadata_timer = QTimer()
+        self.metadata_timer.setSingleShot(True)
+        self.metadata_timer.setInterval(250) # Recount 250ms after the last keystroke
+        self.metadata_timer.timeout.connect(self.refresh_metadata)
+        self.editor.editor.textChanged.connect(self._schedule_metadata_refresh)
+        # Word count is kept per block and only the blocks touched by an edit are recounted
+        self._recount_words()
+        self.editor.editor.document().contentsChange.connect(self._on_contents_change)
         self.editor.editor.verticalScrollBar().valueChanged.connect(self._refresh_page_metadata)
         self.editor.editor.verticalScrollBar().rangeChanged.connect(lambda _min, _max: self._refresh_page_metadata())
+        self._pending_scroll = None # (note, position, doc revision) waiting for the layout to grow
+        self.editor.editor.verticalScrollBar().rangeChanged.connect(self._apply_pending_scroll)
         
         # Connect Editor Toolbar to Custom Title Bar
         self.title_bar.set_editor_toolbar_actions(self.editor.get_toolbar_actions())
@@ -434,8 +725,12 @@ class MainWindow(QMainWindow):
         self.main_splitter.setStretchFactor(1, 0)
         self.main_splitter.setStretchFactor(2, 1)
 
-        # Connect splitter signal to resize images when sidebar is resized
-        self.main_splitter.splitterMoved.connect(self._handle_splitter_resize)
+        # Connect splitter signal to resize images when sidebar is resized (once the drag pauses)
+        self._splitter_resize_timer = QTimer(self)
+        self._splitter_resize_timer.setSingleShot(True)
+        self._splitter_resize_timer.setInterval(80)
+        self._splitter_resize_timer.timeout.connect(self._handle_splitter_resize)
+        self.main_splitter.splitterMoved.connect(lambda *_: self._splitter_resize_timer.start())
         
         # 4. Final Setup: Content only (Title Bar is nested)
         self.main_container = QWidget()
@@ -461,8 +756,12 @@ class MainWindow(QMainWindow):
         self.save_timer = QTimer()
         self.save_timer.setSingleShot(True)
         self.save_timer.setInterval(500) # Wait 500ms after last keystroke
-        self.save_timer.timeout.connect(self._perform_save)
+        self.save_timer.timeout.connect(lambda: self._perform_save(background=True))
         
+        # Widgets restyled by apply_theme(); panels that may be hidden go through _theme_or_defer()
+        self._themable = (self.sidebar, self.note_list, self.editor, self.title_bar)
+        self._deferred_themable = [self.empty_state] # The whiteboard joins when first built
+
         # Apply Saved Theme
         current_theme = styles.resolve_theme_key(self.data_manager.get_setting("theme_mode", "light"))
         self.apply_theme(current_theme)
@@ -538,8 +837,8 @@ class MainWindow(QMainWindow):
                 mode = modes[(idx + 1) % len(modes)]
             except (ValueError, IndexError):
                 mode = "light"
-        else:
-            mode = styles.resolve_theme_key(mode)
+        # Compare canonical keys only; legacy or unknown names would never match _active_theme
+        mode = styles.resolve_theme_key(mode)
 
         if mode == "custom":
             custom_modes = [k for k in styles.theme_cycle_order(include_custom=True) if k.startswith("custom_")]
@@ -548,12 +847,16 @@ class MainWindow(QMainWindow):
         if isinstance(mode, str) and mode.startswith("custom_"):
             custom_data = styles.ZEN_THEME.get(mode)
             if isinstance(custom_data, dict):
-                self.data_manager.set_setting("custom_theme_data", custom_data)
+                self._queue_setting("custom_theme_data", custom_data)
+
+        if mode == self._active_theme and not str(mode).startswith("custom_"):
+            return
 
-        self.data_manager.set_setting("theme_mode", mode)
+        self._queue_setting("theme_mode", mode)
         print(f"DEBUG: toggle_theme called with mode='{mode}'")
 
         # Animate theme switch
+        from ui.animations import crossfade_theme
         crossfade_theme(self, lambda: self.apply_theme(mode))
 
         # Refresh highlight preview so CSS updates instantly.
@@ -561,59 +864,67 @@ class MainWindow(QMainWindow):
 
     def apply_theme(self, mode):
         mode = styles.resolve_theme_key(mode)
-        # Apply global stylesheet
-        css = styles.get_stylesheet(mode)
-
-        base_mode = "dark" if styles.is_dark_theme(mode) else "light"
+        is_custom = str(mode).startswith("custom_")
+        if mode == self._active_theme and not is_custom:
+            return
+        base_mode = _BASE_MODE_BY_THEME.get(mode)
+        if base_mode is None:
+            base_mode = "dark" if styles.is_dark_theme(mode) else "light"
+        # Custom themes can be edited in place, so only built-in stylesheets are memoized
+        compute = _compute_stylesheet.__wrapped__ if is_custom else _compute_stylesheet
         
         try:
-            import qdarktheme
+            if MainWindow._qdarktheme is None:
+                import qdarktheme
+                MainWindow._qdarktheme = qdarktheme
+            qdarktheme = MainWindow._qdarktheme
             # Support for older versions (0.1.7) which only have load_stylesheet
             if hasattr(qdarktheme, 'setup_theme'):
                  qdarktheme.setup_theme(base_mode)
-                 QApplication.instance().setStyleSheet(qdarktheme.load_stylesheet(base_mode) + css)
-            elif hasattr(qdarktheme, 'load_stylesheet'):
-                 # v0.1.7 style
-                 qt_css = qdarktheme.load_stylesheet(base_mode)
-                 QApplication.instance().setStyleSheet(qt_css + css)
-            else:
-                 # Fallback
-                 QApplication.instance().setStyleSheet(css)
+            QApplication.instance().setStyleSheet(compute(mode, base_mode))
         except Exception as e:
             logger.error(f"Theme setup error: {e}")
-            QApplication.instance().setStyleSheet(css)
+            QApplication.instance().setStyleSheet(styles.get_stylesheet(mode))
 
-        # Propagate theme to sidebar and note list
+        # Propagate theme to sidebar, note list, editor (highlighting logic) and title bar
         print(f"DEBUG: apply_theme propagating mode='{mode}' to components")
-        if hasattr(self, 'sidebar'):
-            self.sidebar.set_theme_mode(mode)
-        if hasattr(self, 'note_list'):
-            self.note_list.set_theme_mode(mode)
-        
-        # Propagate theme to editor for highlighting logic
-        if hasattr(self, 'editor'):
-            self.editor.set_theme_mode(mode)
+        for widget in self._themable:
+            widget.set_theme_mode(mode)
 
-        if hasattr(self, 'whiteboard_widget'):
-            self.whiteboard_widget.set_theme_mode(mode)
-
-        if hasattr(self, 'empty_state'):
-            self.empty_state.set_theme_mode(mode)
-        
-        if hasattr(self, 'title_bar'):
-            self.title_bar.set_theme_mode(mode)
+        # Hidden panels are restyled when they are next shown
+        for widget in self._deferred_themable:
+            self._theme_or_defer(widget, mode)
         
         # Trigger initial refresh
-        if hasattr(self, 'editor'):
-            self.editor._refresh_toolbar_icons(mode)
+        self.editor._refresh_toolbar_icons(mode)
             
         # Update open overlays
-        if hasattr(self, '_overlays'):
-            for overlay in self._overlays:
-                try:
-                    overlay.apply_theme(mode)
-                except Exception as e:
-                    logger.error(f"Error updating overlay theme: {e}")
+        for overlay in self._overlays:
+            try:
+                overlay.apply_theme(mode)
+            except Exception as e:
+                logger.error(f"Error updating overlay theme: {e}")
+
+        self._active_theme = mode
+
+    def _theme_or_defer(self, widget, mode):
+        """Apply the theme now, or remember it if the widget has been hidden."""
+        if widget.isHidden() and widget.testAttribute(Qt.WidgetAttribute.WA_WState_ExplicitShowHide):
+            widget._pending_theme_mode = mode
+        else:
+            widget._pending_theme_mode = None
+            widget.set_theme_mode(mode)
+
+    def _apply_pending_theme(self, widget):
+        mode = getattr(widget, '_pending_theme_mode', None)
+        if mode is not None:
+            widget._pending_theme_mode = None
+            widget.set_theme_mode(mode)
+
+    def _queue_setting(self, key, value):
+        """Update a setting in memory and schedule a batched settings.json write."""
+        self.data_manager.set_setting(key, value, save=False)
+        self.data_manager.request_settings_save()
 
     def toggle_wrap(self, enabled):
         """Handle wrap mode toggle from sidebar."""
@@ -621,9 +932,26 @@ class MainWindow(QMainWindow):
         self.sidebar.set_wrap_mode(enabled)
         self.note_list.set_wrap_mode(enabled)
         # Save preference
-        self.data_manager.set_setting("wrap_mode", enabled)
+        self._queue_setting("wrap_mode", enabled)
+
+    def _request_refresh(self, *kinds):
+        """Queue "folders" and/or "notes" refreshes, each performed once after pending events."""
+        self._pending_refresh.update(kinds)
+        self._refresh_flush_timer.start()
+
+    def _request_note_list_refresh(self, select_note_id=None):
+        self._pending_list_selection = (self.current_folder, select_note_id)
+        self._request_refresh("notes")
+
+    def _flush_refresh(self):
+        pending, self._pending_refresh = self._pending_refresh, set()
+        if "folders" in pending:
+            self.refresh_folders()
+        if "notes" in pending:
+            self._refresh_note_list()
 
     def refresh_folders(self):
+        self._pending_refresh.discard("folders")
         self.sidebar.load_notebooks(self.data_manager.notebooks)
         self.sidebar.all_folders = self.data_manager.folders
         # NEW: Load both folders and independent notes for Sidebar's Trash state
@@ -654,14 +982,13 @@ class MainWindow(QMainWindow):
         self.current_folder = None
         self.current_note = None
         self.note_list.load_notes([], folder_id=None)
-        self.editor.clear()
-        self.editor.editor.setReadOnly(True)
+        self._reset_editor()
         self.editor_stack.setCurrentIndex(0) # Show Empty State
-        if hasattr(self, 'whiteboard_widget'):
+        if self.whiteboard_widget is not None:
             self.whiteboard_widget.set_info(None, None)
             self.whiteboard_widget.clear()
         if hasattr(self, 'metadata_bar'):
-            self.metadata_bar.update_stats("")
+            self.metadata_bar.update_stats()
             
         # Select "ALL_NOTEBOOKS_ROOT" if any notebooks are left
         if self.data_manager.notebooks:
@@ -736,8 +1063,8 @@ class MainWindow(QMainWindow):
             folders_meta[folder_id]["description"] = folder.description
             folders_meta[folder_id]["view_mode"] = folder.view_mode
             
-            self.data_manager.set_setting("folders_meta", folders_meta)
-            self.refresh_folders()
+            self._queue_setting("folders_meta", folders_meta)
+            self._request_refresh("folders")
             return
 
         if folder_id == "ROOT":
@@ -794,11 +1121,21 @@ class MainWindow(QMainWindow):
             # Save via Data Manager (using save_note to ensure persistence in FS mode)
             self.data_manager.save_note(self.current_folder, note)
             
-            # Refresh List (preserves selection if possible)
-            # Re-sort happens automatically in load_notes -> filter_notes
-            self.note_list.load_notes(self.current_folder.notes)
-            
-            # Restore selection
+            # Refresh List (preserves selection if possible), coalescing back-to-back updates
+            self._request_note_list_refresh(note_id)
+
+    def _refresh_note_list(self):
+        """Queued note list reload for the folder that was current when it was requested."""
+        folder, note_id = self._pending_list_selection or (None, None)
+        self._pending_list_selection = None
+        # A folder switch in between has already loaded a fresh list
+        if folder is None or folder is not self.current_folder:
+            return
+        # Re-sort happens automatically in load_notes -> filter_notes
+        self.note_list.load_notes(folder.notes, folder_id=getattr(self.note_list, "current_folder_id", None))
+        
+        # Restore selection
+        if note_id:
             self.note_list.select_note_by_id(note_id)
 
     def update_current_note_bg(self, color):
@@ -825,6 +1162,7 @@ class MainWindow(QMainWindow):
             new_editor_w = max(100, editor_w - target_w)
             target_sizes = [sidebar_w, target_w, new_editor_w]
             
+        from ui.animations import animate_splitter
         animate_splitter(self.main_splitter, target_sizes)
 
 
@@ -860,15 +1198,12 @@ class MainWindow(QMainWindow):
             self.current_folder = None
             self.current_note = None
             self.note_list.load_notes([], folder_id=None)
-            self.editor.clear()
-            self.editor.editor.setReadOnly(True)
+            self._reset_editor()
             self.editor_stack.setCurrentIndex(0) # Show Empty State
-            self.whiteboard_widget.set_info(None, None) # Clear WB info
+            if self.whiteboard_widget is not None:
+                self.whiteboard_widget.set_info(None, None) # Clear WB info
             if hasattr(self, 'metadata_bar'):
-                self.metadata_bar.update_stats("") # Clear stats
-        
-        # Refresh current view if it was showing this notebook/folder
-        self.sidebar.refresh_list()
+                self.metadata_bar.update_stats() # Clear stats
 
     def rename_folder(self, folder_id, new_name):
         """Handle folder rename request from sidebar."""
@@ -891,6 +1226,16 @@ class MainWindow(QMainWindow):
             )
         self.editor.clear()
 
+    def _reset_editor(self):
+        """Empty the editor and make it read-only, skipping a reset that would change nothing."""
+        editor = self.editor.editor
+        doc = editor.document()
+        # Clearing an already empty document still rebuilds it and emits change signals
+        if not doc.isEmpty() or doc.isUndoAvailable():
+            self.editor.clear()
+        if not editor.isReadOnly():
+            editor.setReadOnly(True)
+
     # --- Guards ---
     def check_lock(self):
         """Check if note is locked and warn the user."""
@@ -907,27 +1252,21 @@ class MainWindow(QMainWindow):
     def select_folder(self, folder_id):
         if self.check_lock(): return
         if folder_id == "ALL_NOTEBOOKS_ROOT":
-            # Aggregate all notes from all non-archived folders
-            all_notes = []
-            for folder in self.data_manager.folders:
-                if not getattr(folder, 'is_archived', False):
-                    all_notes.extend(folder.notes)
-            
-            # Sort all notes by creation date (newest first)
-            all_notes.sort(key=lambda n: n.created_at, reverse=True)
+            # Aggregate all notes from all non-archived folders, newest first
+            all_notes = self.data_manager.get_all_active_notes_sorted()
             
             self.current_folder = None
             self.note_list.load_notes(all_notes)
             self.current_note = None
-            self.editor.clear()
-            self.editor.editor.setReadOnly(True)
+            self._reset_editor()
             
             # Save Selection
-            self.data_manager.set_setting("last_selected_folder_id", "ALL_NOTEBOOKS_ROOT")
+            self._queue_setting("last_selected_folder_id", "ALL_NOTEBOOKS_ROOT")
             
-            self.whiteboard_widget.set_info("All Notebooks", None)
-            # No whiteboard for aggregate view
-            self.whiteboard_widget.clear()
+            if self.whiteboard_widget is not None:
+                self.whiteboard_widget.set_info("All Notebooks", None)
+                # No whiteboard for aggregate view
+                self.whiteboard_widget.clear()
             
             # Sync Sidebar Visually (if triggered from header)
             self.sidebar.select_folder_by_id("ALL_NOTEBOOKS_ROOT")
@@ -943,11 +1282,11 @@ class MainWindow(QMainWindow):
             
             self.note_list.load_notes(recent_notes)
             self.current_note = None
-            self.editor.clear()
-            self.editor.editor.setReadOnly(True) # Keep ReadOnly until note selected
+            self._reset_editor() # Keep ReadOnly until note selected
             
-            self.whiteboard_widget.set_info("Recent Notes", None)
-            self.whiteboard_widget.clear()
+            if self.whiteboard_widget is not None:
+                self.whiteboard_widget.set_info("Recent Notes", None)
+                self.whiteboard_widget.clear()
             return
 
         if folder_id == "TRASH_ROOT":
@@ -955,11 +1294,11 @@ class MainWindow(QMainWindow):
             self.current_folder = Folder("Trash", "TRASH_ROOT")
             self.note_list.load_notes([], folder_id="TRASH_ROOT")
             self.current_note = None
-            self.editor.clear()
-            self.editor.editor.setReadOnly(True)
+            self._reset_editor()
 
-            self.whiteboard_widget.set_info("Trash", None)
-            self.whiteboard_widget.clear()
+            if self.whiteboard_widget is not None:
+                self.whiteboard_widget.set_info("Trash", None)
+                self.whiteboard_widget.clear()
             return
             
         if folder_id == "ARCHIVED_ROOT":
@@ -968,19 +1307,16 @@ class MainWindow(QMainWindow):
             # Or just ignore if sidebar handles expansion.
             # Sidebar emits ARCHIVED_ROOT when header clicked?
             # Let's show all archived notes for consistency.
-            all_archived = []
-            for f in self.data_manager.folders:
-                if getattr(f, 'is_archived', False):
-                    all_archived.extend(f.notes)
+            all_archived = self.data_manager.get_archived_folder_notes()
             
             self.current_folder = Folder("Archived", "ARCHIVED_ROOT")
             self.current_folder.notes = all_archived
             self.note_list.load_notes(all_archived, folder_id="ARCHIVED_ROOT")
             self.current_note = None
-            self.editor.clear()
-            self.editor.editor.setReadOnly(True)
-            self.whiteboard_widget.set_info("Archived", None)
-            self.whiteboard_widget.clear()
+            self._reset_editor()
+            if self.whiteboard_widget is not None:
+                self.whiteboard_widget.set_info("Archived", None)
+                self.whiteboard_widget.clear()
             return
 
         self.current_folder = self.data_manager.get_folder_by_id(folder_id)
@@ -995,27 +1331,30 @@ class MainWindow(QMainWindow):
                 self.sidebar.select_folder_by_id(folder_id)
                 
                 self.current_note = None
-                self.editor.clear()
-                self.editor.editor.setReadOnly(True)
-                self.whiteboard_widget.set_info(f"Trash: {self.current_folder.name}", None)
-                self.whiteboard_widget.clear()
+                self._reset_editor()
+                if self.whiteboard_widget is not None:
+                    self.whiteboard_widget.set_info(f"Trash: {self.current_folder.name}", None)
+                    self.whiteboard_widget.clear()
                 return
 
         if self.current_folder:
-            self.note_list.load_notes(self.current_folder.notes, folder_id=folder_id)
+            # Restore View Mode before filling the list so items are laid out once,
+            # and hold repaints until the rebuilt list is complete
+            list_view = self.note_list.list_widget
+            list_view.setUpdatesEnabled(False)
+            try:
+                view_mode = self.current_folder.view_mode
+                self.note_list.set_view_mode(view_mode)
+                self.note_list.load_notes(self.current_folder.notes, folder_id=folder_id)
+            finally:
+                list_view.setUpdatesEnabled(True)
             self.current_note = None
-            self.editor.clear()
-            
             # Disable editor until a note is selected
-            self.editor.editor.setReadOnly(True)
+            self._reset_editor()
             self.editor_stack.setCurrentIndex(0)
-
-            # Restore View Mode
-            view_mode = getattr(self.current_folder, 'view_mode', "list")
-            self.note_list.set_view_mode(view_mode)
             
             # Save Selection
-            self.data_manager.set_setting("last_selected_folder_id", folder_id)
+            self._queue_setting("last_selected_folder_id", folder_id)
             
             # Restore Last Used Note for this folder
             folders_meta = self.data_manager.get_setting("folders_meta", {})
@@ -1023,47 +1362,54 @@ class MainWindow(QMainWindow):
                 last_note_id = folders_meta[folder_id].get("last_note_id")
                 if last_note_id:
                     # Verify note exists in current list
-                    if any(n.id == last_note_id for n in self.current_folder.notes):
+                    if self.current_folder.get_note_by_id(last_note_id) is not None:
                          self.note_list.select_note_by_id(last_note_id)
 
             # Update Whiteboard Info (Clear Note Context)
-            self.whiteboard_widget.set_info(self.current_folder.name, None)
-            
             # Load Persistent Whiteboard for this folder
             # This ensures we see the correct board when switching folders
-            try:
-                wb_path = os.path.join(self.data_manager.get_folder_path(self.current_folder), "whiteboard.json")
-                self.whiteboard_widget.load_file(wb_path)
-            except Exception as e:
-                logger.error(f"Error loading folder whiteboard: {e}")
+            if self.whiteboard_widget is not None:
+                self._load_folder_whiteboard(self.current_folder)
     def delete_note(self, note_id):
         """Move note to trash."""
-        if QMessageBox.question(self, "Move to Trash", "Move this note to Trash? You can restore it later.", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No) == QMessageBox.StandardButton.No:
-            return
-
         if not self.current_folder:
             return
 
-        # Check lock status
+        # Check lock status before asking, so a refused delete is never confirmed
         note = self.current_folder.get_note_by_id(note_id)
         if note and getattr(note, 'is_locked', False):
             QMessageBox.warning(self, "Locked", "This note is locked and cannot be deleted.")
             return
-            
+
+        if not self._confirm("Move to Trash", "Move this note to Trash? You can restore it later."):
+            return
+
         # If the deleted note was open, clear editor and close it
         if self.current_note and self.current_note.id == note_id:
             self.current_note = None
             self.editor.clear()
             self.editor_stack.setCurrentWidget(self.empty_state)
-            self.metadata_bar.update_stats("", None)
+            self.metadata_bar.update_stats()
 
         # Delete using DataManager
         self.data_manager.delete_note(self.current_folder, note_id)
         
-        # Reload List
-        self.note_list.load_notes(self.current_folder.notes, folder_id=self.current_folder.id)
+        # Reload List (just drop the row when it is listed)
+        if not self.note_list.remove_item(note_id):
+            self._request_note_list_refresh()
         self.refresh_metadata()
 
+    def _confirm(self, title, text):
+        """Ask a Yes/No question with one reusable message box."""
+        box = self._confirm_dialog
+        if box is None:
+            box = self._confirm_dialog = QMessageBox(self)
+            box.setIcon(QMessageBox.Icon.Question)
+            box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        box.setWindowTitle(title)
+        box.setText(text)
+        return box.exec() == QMessageBox.StandardButton.Yes
+
     def restore_item(self, note_id, trash_path):
         """Restore note or folder from trash."""
         # Check if it was a folder
@@ -1075,7 +1421,7 @@ class MainWindow(QMainWindow):
         
         if success:
             # Full refresh to update sidebar and note list
-            self.refresh_folders()
+            self._request_refresh("folders")
             # If we were in Trash view, reload it
             if self.current_folder and self.current_folder.id == "TRASH_ROOT":
                 self.select_folder("TRASH_ROOT")
@@ -1122,13 +1468,13 @@ class MainWindow(QMainWindow):
                     self.data_manager.permanent_delete_item(note_trash_path)
         
         # Full refresh to update sidebar state
-        self.refresh_folders()
+        self._request_refresh("folders")
         # Reload Trash View (Ensures Empty Trash button visibility)
         self.select_folder("TRASH_ROOT")
 
     def empty_trash(self):
         """Permanently delete all items in trash (Phase 46.1)."""
-        if QMessageBox.question(self, "Empty Trash", "Are you sure you want to permanently delete ALL items in the trash?\nThis action cannot be undone.", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No) == QMessageBox.StandardButton.No:
+        if not self._confirm("Empty Trash", "Are you sure you want to permanently delete ALL items in the trash?\nThis action cannot be undone."):
             return
             
         if self.data_manager.empty_trash():
@@ -1149,12 +1495,7 @@ class MainWindow(QMainWindow):
             target_folder = self.current_folder
             
         if not target_note:
-            for folder in self.data_manager.folders:
-                n = folder.get_note_by_id(note_id)
-                if n:
-                    target_note = n
-                    target_folder = folder
-                    break
+            target_folder, target_note = self.data_manager.find_note_by_id(note_id)
                     
         if not target_note or not target_folder:
             return
@@ -1180,16 +1521,16 @@ class MainWindow(QMainWindow):
         
         success = self.data_manager.rename_note(self.current_folder.id, note_id, new_title)
         if success: 
-            # Refresh note list to show new title
-            self.note_list.load_notes(self.current_folder.notes)
+            # Refresh note list to show new title (only that row when possible)
+            if not self.note_list.update_item(note_id):
+                self.note_list.load_notes(self.current_folder.notes)
             
             # If this was the currently open note, update title without reloading content
             if self.current_note and self.current_note.id == note_id:
                 self.current_note.title = new_title
                 # Block signals to prevent noteSelected from firing and reloading
-                self.note_list.blockSignals(True)
-                self.note_list.select_note_by_id(note_id)
-                self.note_list.blockSignals(False)
+                with QSignalBlocker(self.note_list):
+                    self.note_list.select_note_by_id(note_id)
             else:
                 # For other notes, maintain selection normally
                 self.note_list.select_note_by_id(note_id)
@@ -1200,7 +1541,7 @@ class MainWindow(QMainWindow):
             return
         
         # Identify the note object
-        note = next((n for n in self.current_folder.notes if n.id == note_id), None)
+        note = self.current_folder.get_note_by_id(note_id)
         if not note:
             return
 
@@ -1244,7 +1585,7 @@ class MainWindow(QMainWindow):
                 self.editor_stack.setCurrentIndex(0)
             
             # Refresh source folder note list
-            self.note_list.load_notes(source_folder.notes)
+            self._request_note_list_refresh()
             
             # Show success message
             QMessageBox.information(
@@ -1259,7 +1600,7 @@ class MainWindow(QMainWindow):
         if self.check_lock(): return
         folder = self.current_folder
         if not folder:
-            active_folders = [f for f in self.data_manager.folders if not getattr(f, 'is_archived', False)]
+            active_folders = [f for f in self.data_manager.folders if not f.is_archived]
             if not active_folders:
                 self.show_message(QMessageBox.Icon.Warning, "No Folders", "Please create a folder first.")
                 return
@@ -1280,12 +1621,7 @@ class MainWindow(QMainWindow):
             
             # If we are in aggregate view, we need to reload all notes
             if not self.current_folder:
-                 all_notes = []
-                 for f in self.data_manager.folders:
-                     if not getattr(f, 'is_archived', False):
-                         all_notes.extend(f.notes)
-                 all_notes.sort(key=lambda n: n.created_at, reverse=True)
-                 self.note_list.load_notes(all_notes)
+                 self.note_list.load_notes(self.data_manager.get_all_active_notes_sorted())
             else:
                  self.note_list.load_notes(folder.notes)
                  
@@ -1311,21 +1647,18 @@ class MainWindow(QMainWindow):
             success = self.data_manager.reorder_note(self.current_folder.id, note_id, new_position)
             
             if success:
-                # Reload note list to show new order
-                self.note_list.load_notes(self.current_folder.notes)
+                # Show new order, re-seating only the moved row when the rest is already in place
+                if not self.note_list.move_item(note_id):
+                    self.note_list.load_notes(self.current_folder.notes)
                 
                 # Maintain selection on the reordered note
                 self.note_list.select_note_by_id(note_id)
                 
                 # Update note index in editor if this is the current note
                 if self.current_note and self.current_note.id == note_id:
-                    from models.note import Note
-                    sorted_notes = sorted(self.current_folder.notes, key=Note.sort_key)
-                    try:
-                        note_index = sorted_notes.index(self.current_note) + 1
-                        self.editor.set_base_note_index(note_index)
-                    except ValueError:
-                        pass
+                    position = self.current_folder.sort_index_of(note_id)
+                    if position is not None:
+                        self.editor.set_base_note_index(position + 1)
         finally:
             QApplication.restoreOverrideCursor()
     
@@ -1345,17 +1678,7 @@ class MainWindow(QMainWindow):
         origin_title = origin_note.title if origin_note else "Previous Note"
 
         # 1. Find the note and its folder
-        target_note = None
-        target_folder = None
-        
-        for folder in self.data_manager.folders:
-            for note in folder.notes:
-                if note.id == note_id:
-                    target_note = note
-                    target_folder = folder
-                    break
-            if target_note:
-                break
+        target_folder, target_note = self.data_manager.find_note_by_id(note_id)
         
         if not target_note:
             print(f"DEBUG: Note {note_id} not found in data_manager")
@@ -1373,11 +1696,10 @@ class MainWindow(QMainWindow):
             self.sidebar.select_folder_by_id(target_folder.id)
 
         # 3. Handle Archived/Active View in NoteList
-        if hasattr(target_note, 'is_archived'):
-            is_note_archived = target_note.is_archived
-            if is_note_archived != self.note_list.showing_archived:
-                print(f"DEBUG: Toggling archived view to {is_note_archived}")
-                self.note_list.toggle_archived_view()
+        is_note_archived = target_note.is_archived
+        if is_note_archived != self.note_list.showing_archived:
+            print(f"DEBUG: Toggling archived view to {is_note_archived}")
+            self.note_list.toggle_archived_view()
 
         # 4. Select Note
         print(f"DEBUG: Selecting note {note_id} in NoteList")
@@ -1392,7 +1714,7 @@ class MainWindow(QMainWindow):
     def open_note_overlay(self, note_id):
         """Open a note in a separate overlay window."""
         logger.debug(f"MainWindow.open_note_overlay CALLED: note_id='{note_id}'")
-        note = self.data_manager.get_note_by_id(note_id)
+        _, note = self.data_manager.find_note_by_id(note_id)
         if not note:
             QMessageBox.warning(self, "Note Not Found", "The requested note could not be found.")
             return
@@ -1401,8 +1723,6 @@ class MainWindow(QMainWindow):
         overlay.show()
         
         # Keep a reference to prevent garbage collection if needed
-        if not hasattr(self, '_overlays'):
-            self._overlays = []
         self._overlays.append(overlay)
         # Clean up reference on close
         overlay.finished.connect(lambda: self._overlays.remove(overlay) if overlay in self._overlays else None)
@@ -1444,12 +1764,7 @@ class MainWindow(QMainWindow):
         
         if not target_note:
             # Aggregate view: Find which folder this note belongs to (Active)
-            for folder in self.data_manager.folders:
-                n = folder.get_note_by_id(note_id)
-                if n:
-                    target_note = n
-                    target_folder = folder
-                    break
+            target_folder, target_note = self.data_manager.find_note_by_id(note_id)
                     
         if not target_note:
             # Search in Trash (Folders)
@@ -1477,10 +1792,12 @@ class MainWindow(QMainWindow):
         if self.current_note:
             self.current_note.last_opened = datetime.now().isoformat()
             if self.current_folder:
-                 self.data_manager.save_note(self.current_folder, self.current_note)
+                 self._pending_meta_saves[self.current_note.id] = self.current_note
+                 if not self._meta_save_timer.isActive():
+                     self._meta_save_timer.start()
 
         # Refine target_folder for Recent/Trash views (if they have parent ref)
-        if self.current_folder and self.current_folder.id in ["RECENT_ROOT", "TRASH_ROOT"] and hasattr(target_note, '_parent_folder'):
+        if self.current_folder and self.current_folder.id in ["RECENT_ROOT", "TRASH_ROOT"] and target_note._parent_folder is not None:
              target_folder = target_note._parent_folder
         
         # Check folder context for ReadOnly
@@ -1490,15 +1807,15 @@ class MainWindow(QMainWindow):
              if self.current_folder.id in ["TRASH_ROOT", "ARCHIVED_ROOT"]:
                  force_readonly = True
              # Check Normal Archived Folders
-             elif getattr(self.current_folder, 'is_archived', False):
+             elif self.current_folder.is_archived:
                  force_readonly = True
                  
         # NEW: Trash items are ALWAYS readonly
-        if target_note and getattr(target_note, '_trash_path', None):
+        if target_note and target_note._trash_path:
             force_readonly = True
             
         # Enable editor for typing ONLY if not locked
-        is_locked = getattr(self.current_note, 'is_locked', False)
+        is_locked = self.current_note.is_locked
         self.editor.editor.setReadOnly(is_locked or force_readonly)
         self.editor_stack.setCurrentIndex(1) # Show Editor
         
@@ -1529,13 +1846,11 @@ class MainWindow(QMainWindow):
         self.editor.set_page_size(p_size)
         
         # Calculate note's 1-based index for level numbering
-        from models.note import Note
         if target_folder:
-            sorted_notes = sorted(target_folder.notes, key=Note.sort_key)
-            try:
-                note_index = sorted_notes.index(self.current_note) + 1  # 1-based
-                self.editor.set_base_note_index(note_index)
-            except ValueError:
+            position = target_folder.sort_index_of(self.current_note.id)
+            if position is not None:
+                self.editor.set_base_note_index(position + 1)  # 1-based
+            else:
                 self.editor.set_base_note_index(1)  # Fallback
             
             # Persist as Last Used Note for this folder
@@ -1545,11 +1860,13 @@ class MainWindow(QMainWindow):
         
         # Update Whiteboard Info with Note Name
         f_name = target_folder.name if target_folder else "Trash"
-        self.whiteboard_widget.set_info(f_name, self.current_note.title)
+        if self.whiteboard_widget is not None:
+            self.whiteboard_widget.set_info(f_name, self.current_note.title)
         
         # RESTORE SCROLL POSITION & SPLITTER SIZES
-        # Use QTimer to allow layout/content to be fully set
-        QTimer.singleShot(100, lambda: self._restore_note_layout())
+        # Next event-loop turn, once the new content is in place
+        self._pending_scroll = None
+        QTimer.singleShot(0, self._restore_note_layout)
 
     def _restore_note_layout(self):
         if not self.current_note: return
@@ -1560,7 +1877,22 @@ class MainWindow(QMainWindow):
             
         # Restore Scroll Position
         pos = getattr(self.current_note, 'last_scroll_position', 0)
-        self.editor.editor.verticalScrollBar().setValue(pos)
+        bar = self.editor.editor.verticalScrollBar()
+        bar.setValue(pos)
+        if bar.value() < pos:
+            # Layout is not tall enough yet; finish when the scroll range grows
+            self._pending_scroll = (self.current_note, pos, self.editor.editor.document().revision())
+
+    def _apply_pending_scroll(self, _min, maximum):
+        if self._pending_scroll is None: return
+        note, pos, revision = self._pending_scroll
+        # Give up once another note is open or the user has edited this one
+        if note is not self.current_note or revision != self.editor.editor.document().revision():
+            self._pending_scroll = None
+            return
+        if maximum >= pos:
+            self._pending_scroll = None
+            self.editor.editor.verticalScrollBar().setValue(pos)
 
     def _restore_scroll_position(self):
         # Keep for backward compatibility or if called elsewhere
@@ -1572,8 +1904,18 @@ class MainWindow(QMainWindow):
         """Trigger a debounced save."""
         self.save_timer.start()
 
-    def _perform_save(self):
-        """Actually write to disk."""
+    def _flush_note_meta_saves(self):
+        """Write notes whose only pending change is metadata such as last_opened."""
+        self._meta_save_timer.stop()
+        pending, self._pending_meta_saves = self._pending_meta_saves, {}
+        for note_id, note in pending.items():
+            # Skip notes deleted or moved since they were opened, and write to the real folder
+            folder, live_note = self.data_manager.find_note_by_id(note_id)
+            if live_note is note:
+                self.data_manager.save_note(folder, note)
+
+    def _perform_save(self, background=False):
+        """Actually write to disk. With background=True only serialization runs on the GUI thread."""
         if getattr(self, '_is_saving', False): return
         self._is_saving = True
         
@@ -1587,10 +1929,15 @@ class MainWindow(QMainWindow):
                 self.current_note.content_splitter_sizes = self.content_splitter.sizes()
                 
                 target_folder = self.current_folder
-                if self.current_folder.id == "RECENT_ROOT" and hasattr(self.current_note, '_parent_folder'):
+                if self.current_folder.id == "RECENT_ROOT" and self.current_note._parent_folder is not None:
                      target_folder = self.current_note._parent_folder
                 
-                self.data_manager.save_note(target_folder, self.current_note)
+                if background:
+                    note_path = self.data_manager.stage_note_write(target_folder, self.current_note)
+                    if note_path:
+                        QThreadPool.globalInstance().start(NoteWriteTask(self.data_manager, note_path))
+                else:
+                    self.data_manager.save_note(target_folder, self.current_note)
                 
                 # Live Update Highlight Preview
                 self.refresh_highlight_preview_if_visible()
@@ -1602,7 +1949,7 @@ class MainWindow(QMainWindow):
         finally:
             self._is_saving = False
     
-    def _handle_splitter_resize(self, pos, index):
+    def _handle_splitter_resize(self):
         """Handle main splitter resize event to track drawer state."""
         if not hasattr(self, 'main_splitter'): return
         
@@ -1621,10 +1968,20 @@ class MainWindow(QMainWindow):
         if self.save_timer.isActive():
             self.save_timer.stop()
             self._perform_save()
+
+        if self._settings_flush_timer.isActive():
+            self._settings_flush_timer.stop()
+            self.data_manager.save_settings()
+
+        self._flush_note_meta_saves()
+        self.data_manager.flush_staged_notes()
         
-        # Save whiteboard if visible
-        if hasattr(self, 'whiteboard_widget') and self.whiteboard_widget.isVisible():
+        # Save whiteboard if visible or if strokes are still waiting on the auto-save timer
+        if self.whiteboard_widget is not None and self.whiteboard_widget.isVisible():
+            self.wb_autosave_timer.stop()
             self.auto_save_whiteboard()
+        else:
+            self._flush_whiteboard_save()
         
         # Cleanup child components
         if hasattr(self, 'editor'):
@@ -1633,6 +1990,12 @@ class MainWindow(QMainWindow):
         super().closeEvent(event)
 
 
+    def _flush_pending_save(self):
+        """Save now if edits are waiting on the auto-save timer; otherwise the note is already current."""
+        if self.save_timer.isActive():
+            self.save_timer.stop()
+            self._perform_save()
+
     def save_current_note(self):
         # Force immediate save
         if self.save_timer.isActive():
@@ -1652,61 +2015,109 @@ class MainWindow(QMainWindow):
         if theme_choice == -1:  # Cancelled
             return
         
-        # Determine theme name for progress dialog
-        if isinstance(theme_choice, int):
-            theme_name = ["Light", "Dark", "Sepia"][theme_choice]
-        else:
-            theme_name = f"Custom ({theme_choice})"
+        self.export_folder_by_id_with_theme(folder_id, theme_choice)
 
-        from pdf_export.exporter import export_folder_to_pdf
-        import os
-        
-        # Determine initial directory
+    def _resolve_initial_dir(self):
+        """Starting directory for export dialogs: the last one used, if it still exists."""
         last_dir = self.data_manager.get_setting("last_export_dir")
-        if not last_dir or not os.path.exists(last_dir):
-            last_dir = os.path.expanduser("~/Documents")
-            
-        # Default filename
-        filename = f"{folder.name}_Full_Export.pdf"
-        filename = "".join([c for c in filename if c.isalpha() or c.isdigit() or c==' ' or c=='.']).rstrip()
-        
-        default_path = os.path.join(last_dir, filename)
+        if not last_dir:
+            return _default_export_dir()
+        checked_dir, checked_at = self._export_dir_checked
+        if last_dir != checked_dir or time.monotonic() - checked_at > EXPORT_DIR_CHECK_TTL:
+            if not os.path.isdir(last_dir):
+                return _default_export_dir()
+            self._export_dir_checked = (last_dir, time.monotonic())
+        return last_dir
+
+    def _remember_export_dir(self, new_dir):
+        # The user just picked it in a file dialog, so it is known to exist
+        self._export_dir_checked = (new_dir, time.monotonic())
+        if new_dir != self.data_manager.get_setting("last_export_dir"):
+            self._queue_setting("last_export_dir", new_dir)
+
+    def _choose_export_path(self, default_name, dialog_title, file_filter):
+        """Ask where to save an export, starting in the last export directory; None if cancelled."""
+        dialog = self._save_dialog
+        if dialog is None:
+            # Built once and reused: the Qt dialog keeps its widgets and directory model warm,
+            # where the static native helper starts from scratch on every export
+            dialog = self._save_dialog = QFileDialog(self)
+            dialog.setAcceptMode(QFileDialog.AcceptMode.AcceptSave)
+            dialog.setFileMode(QFileDialog.FileMode.AnyFile)
+            dialog.setOption(QFileDialog.Option.DontUseNativeDialog, True)
+            # Custom folder icons cost a lookup per directory, which is slow on network drives
+            dialog.setOption(QFileDialog.Option.DontUseCustomDirectoryIcons, True)
+        dialog.setWindowTitle(dialog_title)
+        dialog.setNameFilter(file_filter)
+        suffix = _FILTER_SUFFIX_RE.search(file_filter)
+        dialog.setDefaultSuffix(suffix.group(1) if suffix else "")
+        dialog.setDirectory(self._resolve_initial_dir())
+        dialog.selectFile(default_name)
+        if not dialog.exec():
+            return None
+        path = dialog.selectedFiles()[0]
+        self._remember_export_dir(os.path.dirname(path))
+        return path
 
-        # Ask User
-        path, _ = QFileDialog.getSaveFileName(self, "Export Folder to PDF", default_path, "PDF Files (*.pdf)")
-        
+    def _run_pdf_export(self, target, exporter, theme_choice, *, default_name, dialog_title, progress_label, success_text):
+        """Ask where to save, then export `target` to PDF with `exporter` on the thread pool."""
+        path = self._choose_export_path(_sanitize_filename(default_name), dialog_title, "PDF Files (*.pdf)")
         if not path:
             return # Cancelled
 
-        # Save new location
-        new_dir = os.path.dirname(path)
-        self.data_manager.set_setting("last_export_dir", new_dir)
-
-        progress = QProgressDialog(f"Exporting Folder '{folder.name}' ({theme_name} Theme)...", "Cancel", 0, 100, self)
+        theme_name = _export_theme_name(theme_choice)
+        progress = QProgressDialog(f"{progress_label} ({theme_name} Theme)...", "Cancel", 0, 100, self)
         progress.setWindowModality(Qt.WindowModality.WindowModal)
         progress.setMinimumDuration(0) # Show immediately
         progress.setValue(0)
-        
-        def update_folder_progress(current, total):
+
+        task = ExportTask(exporter, _export_snapshot(target), path, theme=theme_choice)
+        self._start_export(progress, task, path, f"{success_text}:\n{path}")
+
+    def _start_export(self, progress, task, output_path, success_text, error_text="Failed to export PDF", page_label=True):
+        """Run an ExportTask on the thread pool, driving `progress` and reporting the outcome."""
+        self._export_tasks.append(task)
+
+        def finish():
+            if task in self._export_tasks:
+                self._export_tasks.remove(task)
+            progress.close()
+            progress.deleteLater() # parented to the window, so close() alone would keep it alive
+
+        def on_progress(current, total):
             if progress.wasCanceled():
                 return
-            progress.setMaximum(total)
-            progress.setLabelText(f"Exporting Page {current} of {total}...")
+            if progress.maximum() != total:
+                progress.setMaximum(total)
+            if page_label:
+                progress.setLabelText(f"Exporting Page {current} of {total}...")
             progress.setValue(current)
 
-        try:
-            export_folder_to_pdf(folder, path, progress_callback=update_folder_progress, theme=theme_choice)
-            
-            if not progress.wasCanceled():
-                progress.setValue(progress.maximum())
-                self.show_message(QMessageBox.Icon.Information, "Export Successful", f"Folder exported to:\n{path}")
-            else:
-                self.show_message(QMessageBox.Icon.Warning, "Export Cancelled", "Export operation was cancelled.")
-        except Exception as e:
-            if not progress.wasCanceled():
-                self.show_message(QMessageBox.Icon.Critical, "Export Error", f"Failed to export PDF:\n{e}")
-        finally:
-            progress.close()
+        def on_finished(result):
+            finish()
+            if result is not False:
+                self.show_message(QMessageBox.Icon.Information, "Export Successful", success_text)
+
+        def on_failed(message):
+            finish()
+            self.show_message(QMessageBox.Icon.Critical, "Export Error", f"{error_text}:\n{message}")
+
+        def on_cancelled():
+            finish()
+            # The exporter stopped part-way; don't leave a truncated file behind
+            try:
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+            except OSError:
+                pass
+            self.show_message(QMessageBox.Icon.Warning, "Export Cancelled", "Export operation was cancelled.")
+
+        task.signals.progress.connect(on_progress)
+        task.signals.finished.connect(on_finished)
+        task.signals.failed.connect(on_failed)
+        task.signals.cancelled.connect(on_cancelled)
+        progress.canceled.connect(task.cancel)
+        QThreadPool.globalInstance().start(task)
 
     def export_folder_whiteboard(self, folder_id):
         """Export the whiteboard.json of the folder to a PDF."""
@@ -1725,58 +2136,46 @@ class MainWindow(QMainWindow):
         if theme_choice == -1:  # Cancelled
             return
 
-        from pdf_export.export_whiteboard import export_whiteboard_to_pdf
-        
-        # Determine initial directory
-        last_dir = self.data_manager.get_setting("last_export_dir")
-        if not last_dir or not os.path.exists(last_dir):
-            last_dir = os.path.expanduser("~/Documents")
-            
-        # Default filename
-        filename = f"{folder.name}_Whiteboard.pdf"
-        filename = "".join([c for c in filename if c.isalpha() or c.isdigit() or c==' ' or c=='.']).rstrip()
-        
-        default_path = os.path.join(last_dir, filename)
-
         # Ask User
-        path, _ = QFileDialog.getSaveFileName(self, "Export Whiteboard to PDF", default_path, "PDF Files (*.pdf)")
-        
+        path = self._choose_export_path(_sanitize_filename(f"{folder.name}_Whiteboard.pdf"), "Export Whiteboard to PDF", "PDF Files (*.pdf)")
         if not path:
             return # Cancelled
 
-        # Save new location
-        new_dir = os.path.dirname(path)
-        self.data_manager.set_setting("last_export_dir", new_dir)
-
         # Progress Dialog
-        if isinstance(theme_choice, int):
-            theme_name = ["Light", "Dark", "Sepia"][theme_choice]
-        else:
-            theme_name = f"Custom ({theme_choice})"
+        theme_name = _export_theme_name(theme_choice)
         progress = QProgressDialog(f"Exporting Whiteboard for '{folder.name}' ({theme_name} Theme)...", "Cancel", 0, 0, self)
         progress.setWindowModality(Qt.WindowModality.WindowModal)
         progress.setMinimumDuration(0)
         progress.setValue(0)
         progress.show()
-        QApplication.processEvents()
-        
-        try:
-            success = export_whiteboard_to_pdf(wb_path, path, parent=self, theme=theme_choice)
-            
-            progress.close()
-            
-            if success:
-                self.show_message(QMessageBox.Icon.Information, "Export Successful", f"Whiteboard exported to:\n{path}")
-            else:
-                self.show_message(QMessageBox.Icon.Warning, "Export Failed", "Failed to export whiteboard.")
-        except Exception as e:
-            progress.close()
-            self.show_message(QMessageBox.Icon.Critical, "Export Error", f"Failed to export PDF:\n{e}")
+
+        # Renders through QPixmap and a canvas widget, so it must stay on the GUI thread;
+        # start it on the next loop turn so the dialog paints first, without processEvents()
+        def run_export():
+            if progress.wasCanceled():
+                progress.deleteLater()
+                return
+            try:
+                success = whiteboard_exporter.export_whiteboard_to_pdf(wb_path, path, parent=self, theme=theme_choice)
+                
+                progress.close()
+                
+                if success:
+                    self.show_message(QMessageBox.Icon.Information, "Export Successful", f"Whiteboard exported to:\n{path}")
+                else:
+                    self.show_message(QMessageBox.Icon.Warning, "Export Failed", "Failed to export whiteboard.")
+            except Exception as e:
+                progress.close()
+                self.show_message(QMessageBox.Icon.Critical, "Export Error", f"Failed to export PDF:\n{e}")
+            finally:
+                progress.deleteLater()
+
+        QTimer.singleShot(0, run_export)
 
     def export_note_by_id_word(self, note_id):
         """Handle export request from context menu for Word."""
         if not self.current_folder: return
-        note = next((n for n in self.current_folder.notes if n.id == note_id), None)
+        note = self.current_folder.get_note_by_id(note_id)
         if not note: return
         
         # Show theme selection dialog first
@@ -1784,18 +2183,11 @@ class MainWindow(QMainWindow):
         if theme_choice == -1:  # Cancelled
             return
 
-        default_name = f"{note.title}.docx"
-        last_dir = self.data_manager.get_setting("last_export_dir", os.path.expanduser("~/Documents"))
-        default_path = os.path.join(last_dir, default_name)
-        
-        path, _ = QFileDialog.getSaveFileName(self, "Export Note to Word", default_path, "Word Documents (*.docx)")
+        path = self._choose_export_path(f"{note.title}.docx", "Export Note to Word", "Word Documents (*.docx)")
         if not path: return
         
-        new_dir = os.path.dirname(path)
-        self.data_manager.set_setting("last_export_dir", new_dir)
-        
         try:
-            success = export_note_to_docx(note, path, theme=theme_choice)
+            success = word_exporter.export_note_to_docx(note, path, theme=theme_choice)
             if success:
                  self.show_message(QMessageBox.Icon.Information, "Export Successful", f"Note exported to:\n{path}")
             else:
@@ -1808,8 +2200,8 @@ class MainWindow(QMainWindow):
         if self.current_folder:
             self.export_folder_by_id(self.current_folder.id)
 
-    def show_pdf_theme_dialog(self):
-        """Show dialog to select PDF export theme."""
+    def _build_theme_dialog(self):
+        """Build the PDF theme picker once; show_pdf_theme_dialog() reuses it."""
         dialog = QDialog(self)
         dialog.setWindowTitle("PDF Export Theme")
         dialog.setWindowModality(Qt.WindowModality.WindowModal)
@@ -1824,34 +2216,33 @@ class MainWindow(QMainWindow):
         layout.addWidget(title_label)
         
         # Theme options
-        theme_group = QButtonGroup()
+        theme_group = QButtonGroup(dialog)
         
         light_radio = QRadioButton("Light Theme (White Background)")
-        light_radio.setChecked(True)  # Default
         light_radio.setStyleSheet("font-size: 12px; padding: 5px;")
-        theme_group.addButton(light_radio, 0)
+        theme_group.addButton(light_radio, ExportTheme.LIGHT)
         
         layout.addWidget(light_radio)
         
         dark_radio = QRadioButton("Dark Theme (Dark Background)")
         dark_radio.setStyleSheet("font-size: 12px; padding: 5px;")
-        theme_group.addButton(dark_radio, 1)
+        theme_group.addButton(dark_radio, ExportTheme.DARK)
         layout.addWidget(dark_radio)
 
         sepia_radio = QRadioButton("Sepia Theme (#f5f0e8 Background)")
         sepia_radio.setStyleSheet("font-size: 12px; padding: 5px;")
-        theme_group.addButton(sepia_radio, 2)
+        theme_group.addButton(sepia_radio, ExportTheme.SEPIA)
         layout.addWidget(sepia_radio)
 
         custom_radio = QRadioButton("Custom Color...")
         custom_radio.setStyleSheet("font-size: 12px; padding: 5px;")
-        theme_group.addButton(custom_radio, 3)
+        theme_group.addButton(custom_radio, ExportTheme.CUSTOM)
         layout.addWidget(custom_radio)
         
         # NEW: Current Background
         current_bg_radio = QRadioButton("Current Background (WYSIWYG)")
         current_bg_radio.setStyleSheet("font-size: 12px; padding: 5px;")
-        theme_group.addButton(current_bg_radio, 4)
+        theme_group.addButton(current_bg_radio, ExportTheme.CURRENT_BACKGROUND)
         layout.addWidget(current_bg_radio)
         
         btn_box = QHBoxLayout()
@@ -1860,19 +2251,31 @@ class MainWindow(QMainWindow):
         btn_box.addStretch()
         btn_box.addWidget(export_btn)
         layout.addLayout(btn_box)
+
+        self._theme_group = theme_group
+        self._theme_default_radio = light_radio
+        return dialog
+
+    def show_pdf_theme_dialog(self):
+        """Show dialog to select PDF export theme."""
+        if self._theme_dialog is None:
+            self._theme_dialog = self._build_theme_dialog()
+        dialog = self._theme_dialog
+        theme_group = self._theme_group
+        self._theme_default_radio.setChecked(True)  # Default
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
             selected_id = theme_group.checkedId()
-            if selected_id == 3: # Custom
+            if selected_id == ExportTheme.CUSTOM:
                 # Get last custom color or default to white
                 last_color = self.data_manager.get_setting("last_export_custom_color", "#FFFFFF")
                 col = QColorDialog.getColor(QColor(last_color), self, "Select Export Background")
                 if col.isValid():
                     hex_color = col.name().upper()
-                    self.data_manager.set_setting("last_export_custom_color", hex_color)
+                    self._queue_setting("last_export_custom_color", hex_color)
                     return hex_color
                 return -1 # Cancelled color picker
-            elif selected_id == 4: # Current Background
+            elif selected_id == ExportTheme.CURRENT_BACKGROUND:
                 # Resolve current background color
                 bg_color = None
                 if self.current_note:
@@ -1897,18 +2300,11 @@ class MainWindow(QMainWindow):
         if theme_choice == -1:  # Cancelled
             return
         
-        default_name = f"{self.current_note.title}.docx"
-        last_dir = self.data_manager.get_setting("last_export_dir", os.path.expanduser("~/Documents"))
-        default_path = os.path.join(last_dir, default_name)
-        
-        path, _ = QFileDialog.getSaveFileName(self, "Export Note to Word", default_path, "Word Documents (*.docx)")
+        path = self._choose_export_path(f"{self.current_note.title}.docx", "Export Note to Word", "Word Documents (*.docx)")
         if not path: return
         
-        new_dir = os.path.dirname(path)
-        self.data_manager.set_setting("last_export_dir", new_dir)
-        
         try:
-            success = export_note_to_docx(self.current_note, path, theme=theme_choice)
+            success = word_exporter.export_note_to_docx(self.current_note, path, theme=theme_choice)
             if success:
                  self.show_message(QMessageBox.Icon.Information, "Export Successful", f"Note exported to:\n{path}")
             else:
@@ -1926,33 +2322,16 @@ class MainWindow(QMainWindow):
         if theme_choice == -1:  # Cancelled
             return
 
-        default_name = f"{folder.name}_Export.docx"
-        last_dir = self.data_manager.get_setting("last_export_dir", os.path.expanduser("~/Documents"))
-        default_path = os.path.join(last_dir, default_name)
-        
-        path, _ = QFileDialog.getSaveFileName(self, "Export Folder to Word", default_path, "Word Documents (*.docx)")
+        path = self._choose_export_path(f"{folder.name}_Export.docx", "Export Folder to Word", "Word Documents (*.docx)")
         if not path: return
         
-        new_dir = os.path.dirname(path)
-        self.data_manager.set_setting("last_export_dir", new_dir)
-        
         progress = QProgressDialog(f"Exporting '{folder.name}' to Word...", "Cancel", 0, len(folder.notes), self)
         progress.setWindowModality(Qt.WindowModality.WindowModal)
         progress.show()
         
-        def update_progress(current, total):
-            progress.setValue(current)
-            if progress.wasCanceled():
-                raise Exception("Export canceled by user")
-        
-        try:
-            success = export_folder_to_docx(folder, path, progress_callback=update_progress, theme=theme_choice)
-            progress.close()
-            if success:
-                 self.show_message(QMessageBox.Icon.Information, "Export Successful", f"Folder exported to:\n{path}")
-        except Exception as e:
-            progress.close()
-            self.show_message(QMessageBox.Icon.Critical, "Export Error", f"Failed to export Word doc:\n{e}")
+        task = ExportTask(word_exporter.export_folder_to_docx, _export_snapshot(folder), path, theme=theme_choice)
+        self._start_export(progress, task, path, f"Folder exported to:\n{path}",
+                           error_text="Failed to export Word doc", page_label=False)
 
     def export_current_note_pdf(self):
         if not self.current_note:
@@ -1964,139 +2343,39 @@ class MainWindow(QMainWindow):
         if theme_choice == -1:  # Cancelled
             return
 
-        from pdf_export.exporter import export_note_to_pdf
-        from PyQt6.QtWidgets import QProgressDialog, QApplication
-        import os
-
-        # Determine initial directory
-        last_dir = self.data_manager.get_setting("last_export_dir")
-        if not last_dir or not os.path.exists(last_dir):
-            last_dir = os.path.expanduser("~/Documents")
-
-        filename = f"{self.current_note.title}.pdf"
-        # Sanitize
-        filename = "".join([c for c in filename if c.isalpha() or c.isdigit() or c==' ' or c=='.']).rstrip()
-        
-        default_path = os.path.join(last_dir, filename)
-
-        # Ask User
-        path, _ = QFileDialog.getSaveFileName(self, "Export Note to PDF", default_path, "PDF Files (*.pdf)")
-        
-        if not path:
-            return # Cancelled
-
-        # Save new location
-        new_dir = os.path.dirname(path)
-        self.data_manager.set_setting("last_export_dir", new_dir)
-        
-        # Progress Dialog
-        if isinstance(theme_choice, int):
-            theme_name = ["Light", "Dark", "Sepia"][theme_choice]
-        else:
-            theme_name = f"Custom ({theme_choice})"
-        progress = QProgressDialog(f"Exporting Note '{self.current_note.title}' ({theme_name} Theme)...", "Cancel", 0, 100, self)
-        progress.setWindowModality(Qt.WindowModality.WindowModal)
-        progress.setMinimumDuration(0) # Show immediately
-        progress.setValue(0)
-        
-        def update_note_progress(current, total):
-            if progress.wasCanceled():
-                return
-            progress.setMaximum(total)
-            progress.setLabelText(f"Exporting Page {current} of {total}...")
-            progress.setValue(current)
-
+        # CRITICAL: Save note before exporting to ensure whiteboard_images are current
+        self._flush_pending_save()
 
-        try:
-            # CRITICAL: Save note before exporting to ensure whiteboard_images are current
-            self._perform_save()
-            
-            export_note_to_pdf(self.current_note, path, progress_callback=update_note_progress, theme=theme_choice)
-           
-            if not progress.wasCanceled():
-                progress.setValue(progress.maximum())
-                self.show_message(QMessageBox.Icon.Information, "Export Successful", f"Note exported to:\n{path}")
-            else:
-                self.show_message(QMessageBox.Icon.Warning, "Export Cancelled", "Export operation was cancelled.")
-        except Exception as e:
-            if not progress.wasCanceled():
-                self.show_message(QMessageBox.Icon.Critical, "Export Error", f"Failed to export PDF:\n{e}")
-        finally:
-            progress.close()
+        note = self.current_note
+        self._run_pdf_export(note, pdf_exporter.export_note_to_pdf, theme_choice,
+                             default_name=f"{note.title}.pdf",
+                             dialog_title="Export Note to PDF",
+                             progress_label=f"Exporting Note '{note.title}'",
+                             success_text="Note exported to")
 
     def export_note_by_id(self, note_id):
         """Handle export request from context menu."""
         if not self.current_folder: return
         
-        note = next((n for n in self.current_folder.notes if n.id == note_id), None)
+        note = self.current_folder.get_note_by_id(note_id)
         if not note: return
         
-        # We can reuse the logic. If the requested note is CURRENT, use main method
-        # If not, temporarily set current note? No, safer to duplicate logic slightly to avoid side effects
-        
         # Show theme selection dialog first
         theme_choice = self.show_pdf_theme_dialog()
         if theme_choice == -1:  # Cancelled
             return
 
-        from pdf_export.exporter import export_note_to_pdf
-        from PyQt6.QtWidgets import QProgressDialog
-        import os
-
-        # Determine initial directory
-        last_dir = self.data_manager.get_setting("last_export_dir")
-        if not last_dir or not os.path.exists(last_dir):
-            last_dir = os.path.expanduser("~/Documents")
-
-        filename = f"{note.title}.pdf"
-        # Sanitize
-        filename = "".join([c for c in filename if c.isalpha() or c.isdigit() or c==' ' or c=='.']).rstrip()
-        
-        default_path = os.path.join(last_dir, filename)
-
-        # Ask User
-        path, _ = QFileDialog.getSaveFileName(self, "Export Note to PDF", default_path, "PDF Files (*.pdf)")
-        
-        if not path:
-            return # Cancelled
-
-        # Save new location
-        new_dir = os.path.dirname(path)
-        self.data_manager.set_setting("last_export_dir", new_dir)
-        
-        # Progress Dialog
-        theme_name = "Light" if theme_choice == 0 else "Dark"
-        progress = QProgressDialog(f"Exporting Note '{note.title}' ({theme_name} Theme)...", "Cancel", 0, 100, self)
-        progress.setWindowModality(Qt.WindowModality.WindowModal)
-        progress.setMinimumDuration(0) # Show immediately
-        progress.setValue(0)
-        
-        def update_note_progress(current, total):
-            if progress.wasCanceled():
-                return
-            progress.setMaximum(total)
-            progress.setLabelText(f"Exporting Page {current} of {total}...")
-            progress.setValue(current)
-
-        try:
-            export_note_to_pdf(note, path, progress_callback=update_note_progress, theme=theme_choice)
-            
-            if not progress.wasCanceled():
-                progress.setValue(progress.maximum())
-                self.show_message(QMessageBox.Icon.Information, "Export Successful", f"Note exported to:\n{path}")
-            else:
-                self.show_message(QMessageBox.Icon.Warning, "Export Cancelled", "Export operation was cancelled.")
-        except Exception as e:
-            if not progress.wasCanceled():
-                self.show_message(QMessageBox.Icon.Critical, "Export Error", f"Failed to export PDF:\n{e}")
-        finally:
-            progress.close()
+        self._run_pdf_export(note, pdf_exporter.export_note_to_pdf, theme_choice,
+                             default_name=f"{note.title}.pdf",
+                             dialog_title="Export Note to PDF",
+                             progress_label=f"Exporting Note '{note.title}'",
+                             success_text="Note exported to")
 
     def preview_note_by_id(self, note_id):
         """Handle preview request from context menu using Virtual Folder."""
         if not self.current_folder: return
         
-        note = next((n for n in self.current_folder.notes if n.id == note_id), None)
+        note = self.current_folder.get_note_by_id(note_id)
         if not note: return
         
         from types import SimpleNamespace
@@ -2117,75 +2396,32 @@ class MainWindow(QMainWindow):
         
         current_theme_mode = self.data_manager.get_setting("theme_mode", "light")
         
-        # Calculate correct note index for numbering
-        start_index = 1
-        try:
-            from models.note import Note
-            sorted_notes = sorted(self.current_folder.notes, key=Note.sort_key)
-            for i, n in enumerate(sorted_notes, 1):
-                if n.id == note.id:
-                    start_index = i
-                    break
-        except Exception as e:
-            print(f"Error calculating note index: {e}")
+        # Note number as shown in the folder's sorted list
+        position = self.current_folder.sort_index_of(note.id)
+        start_index = position + 1 if position is not None else 1
 
         try:
-            dialog = PDFPreviewDialog(virtual_folder, wb_images, self, current_theme_mode, start_index=start_index)
+            cache_key = self._preview_cache_key(virtual_folder, current_theme_mode, start_index)
+            dialog = PDFPreviewDialog(virtual_folder, wb_images, self, current_theme_mode, start_index=start_index,
+                                      cached_chunks=self._preview_cache.get(cache_key))
             
             # Handle export from preview dialog
             def on_export_confirmed(theme_choice):
-                # If user clicks Export in preview, we redirect to the single file export logic
-                # Use the SAME path selection logic as export_note_by_id
-                
-                # Determine initial directory
-                last_dir = self.data_manager.get_setting("last_export_dir")
-                if not last_dir or not os.path.exists(last_dir):
-                    last_dir = os.path.expanduser("~/Documents")
-
-                filename = f"{note.title}.pdf"
-                filename = "".join([c for c in filename if c.isalpha() or c.isdigit() or c==' ' or c=='.']).rstrip()
-                default_path = os.path.join(last_dir, filename)
-
-                # Ask User
-                path, _ = QFileDialog.getSaveFileName(self, "Export Note to PDF", default_path, "PDF Files (*.pdf)")
-                
-                if not path: return 
-
-                new_dir = os.path.dirname(path)
-                self.data_manager.set_setting("last_export_dir", new_dir)
-                
-                # Run Export
-                from pdf_export.exporter import export_note_to_pdf
-                theme_name = "Light" if theme_choice == 0 else "Dark"
-                progress = QProgressDialog(f"Exporting Note '{note.title}' ({theme_name} Theme)...", "Cancel", 0, 100, self)
-                progress.setWindowModality(Qt.WindowModality.WindowModal)
-                progress.setMinimumDuration(0)
-                progress.setValue(0)
-                
-                def update_note_progress(current, total):
-                    if progress.wasCanceled(): return
-                    progress.setMaximum(total)
-                    progress.setLabelText(f"Exporting Page {current} of {total}...")
-                    progress.setValue(current)
+                # Same path selection and export as export_note_by_id
+                # CRITICAL: Save if exporting current note to ensure whiteboard_images are current
+                if note == self.current_note:
+                    self._flush_pending_save()
 
-
-                try:
-                    # CRITICAL: Save if exporting current note to ensure whiteboard_images are current
-                    if note == self.current_note:
-                        self._perform_save()
-                    
-                    export_note_to_pdf(note, path, progress_callback=update_note_progress, theme=theme_choice)
-                    if not progress.wasCanceled():
-                        progress.setValue(progress.maximum())
-                        self.show_message(QMessageBox.Icon.Information, "Export Successful", f"Note exported to:\n{path}")
-                except Exception as e:
-                    if not progress.wasCanceled():
-                        self.show_message(QMessageBox.Icon.Critical, "Export Error", f"Failed to export PDF:\n{e}")
-                finally:
-                    progress.close()
+                self._run_pdf_export(note, pdf_exporter.export_note_to_pdf, theme_choice,
+                                     default_name=f"{note.title}.pdf",
+                                     dialog_title="Export Note to PDF",
+                                     progress_label=f"Exporting Note '{note.title}'",
+                                     success_text="Note exported to")
 
             dialog.exportConfirmed.connect(on_export_confirmed)
             dialog.exec()
+            self._remember_preview(cache_key, dialog)
+            dialog.deleteLater()
             
         except Exception as e:
             import traceback
@@ -2193,32 +2429,47 @@ class MainWindow(QMainWindow):
             self.show_message(QMessageBox.Icon.Critical, "Preview Error", f"An error occurred while opening preview:\n{e}")
 
 
+    def _preview_cache_key(self, folder, theme_mode, start_index=1):
+        # str hashes are cached on the object, so this stays cheap for large notes and images
+        notes = tuple((n.id, n.title, Note.sort_key(n), hash(n.content), len(n.content),
+                       tuple((name, len(data), hash(data)) for name, data in n.whiteboard_images.items()))
+                      for n in folder.notes)
+        return (folder.id, folder.name, theme_mode, start_index, notes)
+
+    def _remember_preview(self, key, dialog):
+        if dialog.rendered_chunks is None:
+            return # Closed before the render completed
+        self._preview_cache[key] = dialog.rendered_chunks
+        self._preview_cache.move_to_end(key)
+        while len(self._preview_cache) > PREVIEW_CACHE_SIZE:
+            self._preview_cache.popitem(last=False)
+
     def show_pdf_preview(self):
         if not self.current_folder:
             self.show_message(QMessageBox.Icon.Warning, "No Folder", "Please select a folder to preview.")
             return
 
-        from pdf_export.exporter import generate_folder_html, process_images_for_pdf, apply_theme_to_html
         from ui.preview_dialog import PDFPreviewDialog
         
         # Generate HTML with performance optimizations
         try:
-            # Aggregate all images first
-            all_whiteboard_images = {}
-            for note in self.current_folder.notes:
-                wb_imgs = getattr(note, 'whiteboard_images', {})
-                all_whiteboard_images.update(wb_imgs)
+            # One view over every note's images; nothing is copied up front
+            all_whiteboard_images = ChainMap(*[note.whiteboard_images for note in reversed(self.current_folder.notes)])
             
             # Get current theme mode
             current_theme_mode = self.data_manager.get_setting("theme_mode", "light")
             
             # Show Dialog with theme selection
-            dialog = PDFPreviewDialog(self.current_folder, all_whiteboard_images, self, current_theme_mode=current_theme_mode)
+            cache_key = self._preview_cache_key(self.current_folder, current_theme_mode)
+            dialog = PDFPreviewDialog(self.current_folder, all_whiteboard_images, self, current_theme_mode=current_theme_mode,
+                                      cached_chunks=self._preview_cache.get(cache_key))
             
             # Connect Export button from dialog to actual export function with selected theme
             dialog.exportConfirmed.connect(lambda theme: self.export_folder_by_id_with_theme(self.current_folder.id, theme))
             
             dialog.exec()
+            self._remember_preview(cache_key, dialog)
+            dialog.deleteLater()
             
         except Exception as e:
             self.show_message(QMessageBox.Icon.Critical, "Preview Error", f"Failed to generate preview:\n{e}")
@@ -2254,59 +2505,11 @@ class MainWindow(QMainWindow):
         if not folder:
             return
         
-        from pdf_export.exporter import export_folder_to_pdf
-        import os
-        
-        # Determine initial directory
-        last_dir = self.data_manager.get_setting("last_export_dir")
-        if not last_dir or not os.path.exists(last_dir):
-            last_dir = os.path.expanduser("~/Documents")
-            
-        # Default filename
-        filename = f"{folder.name}_Full_Export.pdf"
-        filename = "".join([c for c in filename if c.isalpha() or c.isdigit() or c==' ' or c=='.']).rstrip()
-        
-        default_path = os.path.join(last_dir, filename)
-
-        # Ask User for save location
-        path, _ = QFileDialog.getSaveFileName(self, "Export Folder to PDF", default_path, "PDF Files (*.pdf)")
-        
-        if not path:
-            return # Cancelled
-
-        # Save new location
-        new_dir = os.path.dirname(path)
-        self.data_manager.set_setting("last_export_dir", new_dir)
-
-        # Progress Dialog for folder export
-        theme_name = "Light" if theme_choice == 0 else "Dark"
-        progress = QProgressDialog(f"Exporting Folder '{folder.name}' ({theme_name} Theme)...", "Cancel", 0, 100, self)
-        progress.setWindowModality(Qt.WindowModality.WindowModal)
-        progress.setMinimumDuration(0) # Show immediately
-        progress.setValue(0)
-        
-        def update_folder_progress(current, total):
-            if progress.wasCanceled():
-                return
-            progress.setMaximum(total)
-            progress.setLabelText(f"Exporting Page {current} of {total}...")
-            progress.setValue(current)
-
-        try:
-            export_folder_to_pdf(folder, path, progress_callback=update_folder_progress, theme=theme_choice)
-            
-            if not progress.wasCanceled():
-                progress.setValue(progress.maximum())
-                self.show_message(QMessageBox.Icon.Information, "Export Successful", f"Folder exported to:\n{path}")
-            else:
-                self.show_message(QMessageBox.Icon.Warning, "Export Cancelled", "Export operation was cancelled.")
-        except Exception as e:
-            if not progress.wasCanceled():
-                self.show_message(QMessageBox.Icon.Critical, "Export Error", f"Failed to export PDF:\n{e}")
-        finally:
-            progress.close()
-
-
+        self._run_pdf_export(folder, pdf_exporter.export_folder_to_pdf, theme_choice,
+                             default_name=f"{folder.name}_Full_Export.pdf",
+                             dialog_title="Export Folder to PDF",
+                             progress_label=f"Exporting Folder '{folder.name}'",
+                             success_text="Folder exported to")
 
     def export_current_highlights(self):
         """Re-extract and export highlights"""
@@ -2320,25 +2523,19 @@ class MainWindow(QMainWindow):
         # Toggle: If visible, hide it and restore sidebar/list
         if hasattr(self, 'highlight_view') and self.highlight_view.isVisible():
             self.highlight_view.setVisible(False)
-            self.sidebar.setVisible(True)
-            self.note_list.setVisible(True)
+            self._set_shown(self.sidebar, True)
+            self._set_shown(self.note_list, True)
             return
 
         if not self.current_folder:
             self.show_message(QMessageBox.Icon.Warning, "No Folder", "Please select a folder to preview highlights.")
             return
 
-        # Extract highlights
-        # SORT NOTES: Using 'order' if available, else 'updated_at' or 'id'
-        # Assuming notes have an 'order' attribute from database
-        try:
-             sorted_notes = sorted(self.current_folder.notes, key=lambda n: n.order)
-        except Exception:
-             # Fallback if order is missing
-             sorted_notes = self.current_folder.notes
+        # Extract highlights in the folder's display order (cached on the Folder)
+        sorted_notes = self.current_folder.sorted_notes
         
-        # Sync Content: Ensure the currently open note is up-to-date in the list
-        if self.current_note:
+        # Sync Content: only edits still waiting on the auto-save timer are missing from note.content
+        if self.current_note and self.save_timer.isActive():
             current_html = self.editor.get_html()
             # Update the object in the list
             for note in sorted_notes:
@@ -2346,98 +2543,157 @@ class MainWindow(QMainWindow):
                     note.content = current_html
                     break
              
-        grouped_highlights, total_count = self._extract_highlights(sorted_notes)
-        
-        if not grouped_highlights:
-            # Allow empty state
-            pass
-        
-        # Generate HTML
-        html_content = self._generate_highlight_preview_html(grouped_highlights, total_count)
-        self.highlight_view.setHtml(html_content)
+        self._render_highlight_view(sorted_notes)
         
         # Ensure links are captured (Fix for buttons not working)
         self.highlight_view.setOpenLinks(False) 
         
         # Hide whiteboard widget if it's open (mutually exclusive)
-        if self.whiteboard_widget.isVisible():
+        if self.whiteboard_widget is not None and self.whiteboard_widget.isVisible():
             self.whiteboard_widget.setVisible(False)
         
         # Show Split View (on the LEFT of Editor)
-        self.highlight_view.setVisible(True)
+        self._set_shown(self.highlight_view, True)
         # Hide Sidebar and List for 50/50 Focus
-        self.sidebar.setVisible(False)
-        self.note_list.setVisible(False)
+        self._set_shown(self.sidebar, False)
+        self._set_shown(self.note_list, False)
         
         # Set 50/50 split for [highlight_view, whiteboard_placeholder (hidden), editor]
-        total_width = self.width()
-        self.content_splitter.setSizes([total_width // 2, 0, total_width // 2])
+        # (setSizes scales these to the available space)
+        self.content_splitter.setSizes([10000, 0, 10000])
+
+    @contextlib.contextmanager
+    def _updates_paused(self):
+        """Hold window repaints so a batch of show/hide and splitter changes lands in one pass."""
+        self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.setUpdatesEnabled(True)
+
+    @staticmethod
+    def _set_shown(widget, shown):
+        """setVisible() only when the explicit show/hide state actually changes."""
+        # isHidden(), not isVisible(): a child of a hidden window is not visible but may still need hiding
+        if widget.isHidden() == shown:
+            widget.setVisible(shown)
 
     def show_whiteboard_split_view(self):
         """Show whiteboard in Split View - embedded like Highlight Preview"""
         
         # Toggle: If whiteboard widget is visible, hide it and restore sidebar/list
-        if self.whiteboard_widget.isVisible():
-            self.whiteboard_widget.setVisible(False)
-            self.sidebar.setVisible(True)
-            self.note_list.setVisible(True)
+        if self.whiteboard_widget is not None and self.whiteboard_widget.isVisible():
+            self._flush_whiteboard_save()
+            with self._updates_paused():
+                self.whiteboard_widget.setVisible(False)
+                self._set_shown(self.sidebar, True)
+                self._set_shown(self.note_list, True)
             return
 
         if not self.current_folder:
             self.show_message(QMessageBox.Icon.Warning, "No Folder", "Please select a folder to use whiteboard.")
             return
 
-        # Hide highlight view if it's open (mutually exclusive)
-        if self.highlight_view.isVisible():
-            self.highlight_view.setVisible(False)
+        with self._updates_paused():
+            # Hide highlight view if it's open (mutually exclusive)
+            if self.highlight_view.isVisible():
+                self.highlight_view.setVisible(False)
 
-        # Hide Sidebar and Note List for split view (EXACTLY like Highlight Preview)
-        self.sidebar.setVisible(False)
-        self.note_list.setVisible(False)
+            # Hide Sidebar and Note List for split view (EXACTLY like Highlight Preview)
+            self._set_shown(self.sidebar, False)
+            self._set_shown(self.note_list, False)
 
-        # Load folder-specific whiteboard file
-        folder_path = self.data_manager.get_folder_path(self.current_folder)
-        if folder_path:
-            wb_path = os.path.join(folder_path, "whiteboard.json")
-            self.whiteboard_widget.load_file(wb_path)
+            # Load folder-specific whiteboard file
+            wb = self._ensure_whiteboard()
+            folder_path = self.data_manager.get_folder_path(self.current_folder)
+            if folder_path:
+                wb_path = os.path.join(folder_path, "whiteboard.json")
+                # _ensure_whiteboard() may already have this board loaded or loading
+                if wb_path not in (wb.active_file_path, wb._pending_load_path):
+                    self._load_folder_whiteboard(self.current_folder)
             
-            # Set Info with Note Name if available
-            note_name = self.current_note.title if self.current_note else None
-            self.whiteboard_widget.set_info(self.current_folder.name, note_name)
+                # Set Info with Note Name if available
+                note_name = self.current_note.title if self.current_note else None
+                self.whiteboard_widget.set_info(self.current_folder.name, note_name)
 
-        # Show Whiteboard Widget (embedded in splitter)
-        self.whiteboard_widget.setVisible(True)
+            # Show Whiteboard Widget (embedded in splitter)
+            self._apply_pending_theme(self.whiteboard_widget)
+            self.whiteboard_widget.setVisible(True)
         
-        # Set 50/50 split (highlight hidden=0, whiteboard 50%, editor 50%)
-        total_width = self.width()
-        # Sizes: [highlight_view (hidden=0), whiteboard_widget (50%), editor (50%)]
-        self.content_splitter.setSizes([0, total_width // 2, total_width // 2])
+            # Set 50/50 split (highlight hidden=0, whiteboard 50%, editor 50%)
+            # Sizes: [highlight_view (hidden=0), whiteboard_widget (50%), editor (50%)]
+            self.content_splitter.setSizes([0, 10000, 10000])
 
     def on_whiteboard_closed(self):
         """Handle whiteboard close event - Restore default view"""
-        if self.whiteboard_widget.isVisible():
-            self.whiteboard_widget.setVisible(False)
-            
-            # Clear editing state so next regular insert is new
-            self.editing_image_id = None
-            
-            # Restore Sidebar and Note List
-            self.sidebar.setVisible(True)
-            self.note_list.setVisible(True)
-            
-            # Reset Splitter: [Sidebar(150), NoteList(250), Editor(Rest)]
-            # Since we collapsed them to 0 in jump_to_whiteboard, we MUST restore sizes explicitly
-            main_splitter = self.centralWidget()
-            if isinstance(main_splitter, QSplitter):
-                current_total = main_splitter.width()
-                # Restore to default proportions
-                main_splitter.setSizes([150, 250, current_total - 400])
-            
-            # For the INNER content splitter (Highlight/Whiteboard/Editor)
-            # Ensure Editor takes full width of that section
-            total_width = self.width()
-            h_view_size = self.content_splitter.sizes()[0]
-            self.content_splitter.setSizes([h_view_size, 0, total_width]) 
+        if self.whiteboard_widget is not None and self.whiteboard_widget.isVisible():
+            # auto_save_whiteboard() only falls back to the folder board while it is visible
+            self._flush_whiteboard_save()
+            with self._updates_paused():
+                self.whiteboard_widget.setVisible(False)
+            
+                # Clear editing state so next regular insert is new
+                self.editing_image_id = None
+            
+                # Restore Sidebar and Note List
+                self._set_shown(self.sidebar, True)
+                self._set_shown(self.note_list, True)
+            
+                # Reset Splitter: [Sidebar(150), NoteList(250), Editor(Rest)]
+                # Since we collapsed them to 0 in jump_to_whiteboard, we MUST restore sizes explicitly
+                main_splitter = self.centralWidget()
+                if isinstance(main_splitter, QSplitter):
+                    current_total = main_splitter.width()
+                    # Restore to default proportions
+                    main_splitter.setSizes([150, 250, current_total - 400])
+            
+                # For the INNER content splitter (Highlight/Whiteboard/Editor)
+                # Ensure Editor takes full width of that section
+                total_width = self.width()
+                h_view_size = self.content_splitter.sizes()[0]
+                self.content_splitter.setSizes([h_view_size, 0, total_width]) 
+
+    def _ensure_whiteboard(self):
+        """Create the whiteboard panel on first use, synced to the current folder/note."""
+        if self.whiteboard_widget is not None:
+            return self.whiteboard_widget
+
+        from ui.whiteboard_widget import WhiteboardWidget
+        wb = WhiteboardWidget()
+        wb.contentChanged.connect(lambda: self.wb_autosave_timer.start())
+        wb.closed.connect(self.on_whiteboard_closed)
+        wb.insert_requested.connect(self.insert_image_to_note)
+        self.content_splitter.replaceWidget(1, wb)
+        wb.setVisible(False)
+        self._whiteboard_placeholder.deleteLater()
+        self._whiteboard_placeholder = None
+        self.whiteboard_widget = wb
+        # Themed by _apply_pending_theme() when it is first shown
+        wb._pending_theme_mode = self._active_theme
+        self._deferred_themable.append(wb)
+
+        folder = self.current_folder
+        if folder and self.data_manager.get_folder_by_id(folder.id) is folder:
+            self._load_folder_whiteboard(folder)
+            if self.current_note:
+                wb.set_info(folder.name, self.current_note.title)
+        return wb
+
+    def _flush_whiteboard_save(self):
+        """Save now if strokes are waiting on the whiteboard auto-save timer."""
+        if self.wb_autosave_timer.isActive():
+            self.wb_autosave_timer.stop()
+            self.auto_save_whiteboard()
+
+    def _load_folder_whiteboard(self, folder):
+        # Pending strokes belong to the board being replaced
+        self._flush_whiteboard_save()
+        self.whiteboard_widget.set_info(folder.name, None)
+        try:
+            wb_path = os.path.join(self.data_manager.get_folder_path(folder), "whiteboard.json")
+            self.whiteboard_widget.load_file_async(wb_path)
+        except Exception as e:
+            logger.error(f"Error loading folder whiteboard: {e}")
 
     def auto_save_whiteboard(self):
         """Auto-save whiteboard when content changes"""
@@ -2484,28 +2740,30 @@ class MainWindow(QMainWindow):
 
     def jump_to_whiteboard(self, metadata):
         """Open whiteboard and jump to specific page"""
-        if not self.whiteboard_widget.isVisible():
-            self.whiteboard_widget.setVisible(True)
-            
-        # 1. Collapse Sidebars (User Request: "open complete")
-        # Access main splitter (Sidebar, NoteList, Content)
-        main_splitter = self.centralWidget()
-        if isinstance(main_splitter, QSplitter):
-            total_w = main_splitter.width()
-            # Collapse Sidebar (0) and NoteList (1), give all to Content (2)
-            main_splitter.setSizes([0, 0, total_w])
+        with self._updates_paused():
+            self._ensure_whiteboard()
+            if not self.whiteboard_widget.isVisible():
+                self._apply_pending_theme(self.whiteboard_widget)
+                self.whiteboard_widget.setVisible(True)
+            
+            # 1. Collapse Sidebars (User Request: "open complete")
+            # Access main splitter (Sidebar, NoteList, Content)
+            main_splitter = self.centralWidget()
+            if isinstance(main_splitter, QSplitter):
+                total_w = main_splitter.width()
+                # Collapse Sidebar (0) and NoteList (1), give all to Content (2)
+                main_splitter.setSizes([0, 0, total_w])
 
-        # 2. Ensure 50/50 split layout between Whiteboard and Editor
-        # ContentSplitter: Highlight (0), Whiteboard (1), Editor (2)
-        sizes = self.content_splitter.sizes()
-        h_view_size = sizes[0] # Preserve highlight view
+            # 2. Ensure 50/50 split layout between Whiteboard and Editor
+            # ContentSplitter: Highlight (0), Whiteboard (1), Editor (2)
+            sizes = self.content_splitter.sizes()
+            h_view_size = sizes[0] # Preserve highlight view
         
-        # Use large equal numbers to enforce 50/50 ratio
-        self.content_splitter.setSizes([h_view_size, 10000, 10000])
+            # Use large equal numbers to enforce 50/50 ratio
+            self.content_splitter.setSizes([h_view_size, 10000, 10000])
         
         # Load specific whiteboard file if provided (Cross-folder support)
         if 'wb_file' in metadata and metadata['wb_file']:
-             import os
              if os.path.exists(metadata['wb_file']):
                  # Check if we need to switch file
                  if self.whiteboard_widget.active_file_path != metadata['wb_file']:
@@ -2522,10 +2780,8 @@ class MainWindow(QMainWindow):
 
     def _extract_highlights(self, notes):
         """Helper to extract highlights from notes using Logical IDs."""
-        from bs4 import BeautifulSoup, NavigableString
-        import re
-        from PyQt6.QtGui import QColor
-        import uuid
+        # Kept local: bs4 is only needed once highlights are shown, not at startup
+        from bs4 import BeautifulSoup
 
         grouped_highlights = {}
         total_count = 0
@@ -2533,40 +2789,21 @@ class MainWindow(QMainWindow):
         # Get custom color from settings
         custom_hl_color = self.data_manager.get_setting("custom_highlight_color", "cyan")
         
-        # Normalize colors to hex for comparison
-        def normalize_color(c):
-             try:
-                 col = QColor(c)
-                 if col.isValid():
-                     return col.name().lower() # Returns #rrggbb
-             except Exception:
-                 pass
-             return str(c).lower()
-
-        # Define Known Colors (Hex) - Normalized to lowercase
-        valid_colors = {
-            "#ffff00", "yellow", # Standard Yellow
-            "#00ffff", "cyan",   # Standard Cyan
-            "#00ff00", "lime",   # Green
-            "#ff00ff", "magenta",# Pink/Magenta
-            "#ff0000", "red",    # Red
-            "#ffa500", "orange", # Orange
-            "#b0b000",           # Dark Mode Gold
-            normalize_color(custom_hl_color) # USER CUSTOM COLOR
-        }
+        valid_colors = _HL_KNOWN_COLORS | {_normalize_color(custom_hl_color)} # + USER CUSTOM COLOR
         
         # Check setting
         only_custom = self.data_manager.get_setting("strict_highlight_export", True)
 
+        # Cached per-note results are only valid for the color settings they were parsed with
+        hl_cache = self._hl_cache
+        if self._hl_cache_settings != (custom_hl_color, only_custom):
+            hl_cache.clear()
+            self._hl_cache_settings = (custom_hl_color, only_custom)
+
         def is_valid_bg(c_hex):
             if not c_hex: return None
             c_hex = c_hex.lower()
-            norm_hex = c_hex
-            try:
-                col = QColor(c_hex)
-                if col.isValid():
-                     norm_hex = col.name().lower()
-            except: pass
+            norm_hex = _normalize_color(c_hex)
             
             if not only_custom: return norm_hex
             if norm_hex in valid_colors: return norm_hex
@@ -2585,6 +2822,22 @@ class MainWindow(QMainWindow):
                 continue
             if len(note.content.strip()) == 0:
                 continue
+
+            # Reuse the parse while the content is unchanged (str hashes are cached on the object)
+            content_key = (hash(note.content), len(note.content))
+            cached = hl_cache.get(note.id)
+            if cached is not None and cached[0] == content_key:
+                hl_cache.move_to_end(note.id)
+                items = cached[1]
+                if items:
+                    grouped_highlights[note.id] = {'title': note.title, 'items': items}
+                    total_count += len(items)
+                continue
+
+            # Nothing the candidate selector below could match: skip the parse
+            c = note.content
+            if 'background' not in c and '<u' not in c and 'text-decoration' not in c and 'hl_' not in c:
+                continue
             
             try:
                 soup = BeautifulSoup(note.content, 'html.parser')
@@ -2594,20 +2847,35 @@ class MainWindow(QMainWindow):
                 candidate_tags = soup.select('[style*="background"], u, [style*="text-decoration"], [title^="hl_"]')
                 # print(f"DEBUG: Candidate Tags Found: {len(candidate_tags)}")
                 
-                processed_tags = set()
                 items = []
                 
                 # Temporary storage for grouping
                 # Map: GroupID -> List of items
                 # We need to maintain ORDER
                 ordered_groups = [] # List of {'id': id, 'items': [item1, item2], 'color': c, 'type': t}
+                id_to_group = {} # hid -> its entry in ordered_groups
                 
                 # Legacy Continuity Helper
                 last_legacy_group = None
+
+                # Sibling highlights share their ancestors, so each element's indent is summed once
+                indent_cache = {} # id(element) -> indent of the element and its ancestors
+                def get_indent(el):
+                    if el is None or el.name in ('body', '[document]'):
+                        return 0
+                    indent = indent_cache.get(id(el))
+                    if indent is None:
+                        indent = get_indent(el.parent)
+                        if el.name in ('ul', 'ol', 'blockquote'): indent += 20
+                        s = el.get('style', '').lower()
+                        if 'margin-left' in s:
+                            m = _HL_MARGIN_RE.search(s)
+                            if m: indent += int(m.group(1))
+                        indent_cache[id(el)] = indent
+                    return indent
                 
+                # select() yields each matching element once, in document order
                 for tag in candidate_tags:
-                    if tag in processed_tags: continue
-                    
                     # 1. Extract Info
                     style = tag.get("style", "").lower()
                     title = tag.get("title", "")
@@ -2617,7 +2885,7 @@ class MainWindow(QMainWindow):
                     
                     # EXTRACT ID FROM FONT FAMILY (Robust Persistence)
                     # Look for hl_ or ul_ in the style string
-                    id_match = re.search(r"(?:'|\"| |^)(hl_[a-f0-9]{8,}|ul_[a-f0-9]{8,})(?:'|\"|;|$)", style)
+                    id_match = _HL_ID_RE.search(style)
                     if id_match:
                          hid = id_match.group(1)
 
@@ -2628,7 +2896,7 @@ class MainWindow(QMainWindow):
                     # Background check
                     # Background check
                     if "background" in style:
-                        m = re.search(r'background(?:-color)?:\s*([^;"]+)', style)
+                        m = _HL_BG_RE.search(style)
                         if m:
                             c = m.group(1).strip()
                             norm_bg = is_valid_bg(c)
@@ -2639,7 +2907,7 @@ class MainWindow(QMainWindow):
                                 # PERSISTENCE FALLBACK:
                                 # If strict check failed (color not in whitelist) BUT we have a valid Logical ID,
                                 # we explicitly TRUST this is a highlight and safeguard the color used.
-                                bg_color = normalize_color(c)
+                                bg_color = _normalize_color(c)
                                 final_type = 'highlight'
                     
                     # Underline check
@@ -2686,24 +2954,13 @@ class MainWindow(QMainWindow):
                     # Extract Text
                     raw_html = tag.decode_contents()
                     # Strip styles for clean preview
-                    raw_html = re.sub(r'\s*style="[^"]*"', '', raw_html)
-                    raw_html = re.sub(r"\s*style='[^']*'", '', raw_html)
-                    raw_html = re.sub(r'\s*class="[^"]*"', '', raw_html)
+                    raw_html = _HL_ATTR_STRIP_RE.sub('', raw_html)
                     text = raw_html.strip()
                     
                     if not text: continue
                     
                     # Calculate Indent
-                    indent = 0
-                    curr = tag
-                    while curr and hasattr(curr, 'name') and curr.name not in ['body', '[document]']:
-                         if curr.name in ['ul', 'ol', 'blockquote']: indent += 20
-                         if hasattr(curr, 'get'):
-                             s = curr.get('style', '').lower()
-                             if 'margin-left' in s:
-                                 m = re.search(r'margin-left:\s*(\d+)px', s)
-                                 if m: indent += int(m.group(1))
-                         curr = curr.parent
+                    indent = get_indent(tag)
 
                     item_data = {
                         'text': text,
@@ -2716,11 +2973,7 @@ class MainWindow(QMainWindow):
                     
                     # A. Logic ID Grouping (Strong)
                     if hid:
-                        # Search existing groups for this ID
-                        for group in ordered_groups:
-                            if group['id'] == hid:
-                                target_group = group
-                                break
+                        target_group = id_to_group.get(hid)
                         
                         if not target_group:
                             # Create new group
@@ -2731,6 +2984,7 @@ class MainWindow(QMainWindow):
                                 'items': []
                             }
                             ordered_groups.append(target_group)
+                            id_to_group[hid] = target_group
                             
                         # Add to group
                         target_group['items'].append(item_data)
@@ -2768,8 +3022,6 @@ class MainWindow(QMainWindow):
                         
                         last_legacy_group = target_group
 
-                    processed_tags.add(tag)
-
                 # Finalize Groups to Items
                 for group in ordered_groups:
                     # Combine Texts
@@ -2795,55 +3047,92 @@ class MainWindow(QMainWindow):
                         'indent': group['items'][0]['indent'] # Use first indent
                     })
 
+                hl_cache[note.id] = (content_key, items)
+                hl_cache.move_to_end(note.id)
+                if len(hl_cache) > HIGHLIGHT_CACHE_SIZE:
+                    hl_cache.popitem(last=False)
+
                 if items:
                     grouped_highlights[note.id] = {'title': note.title, 'items': items}
                     total_count += len(items)
 
-            except Exception as e:
-                print(f"Error parsing note {note.id}: {e}")
-                import traceback
-                traceback.print_exc()
-            except Exception as e:
-                print(f"ERROR processing note {note.id}: {e}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.error(f"Error parsing highlights of note {note.id}", exc_info=True)
                 continue
         return grouped_highlights, total_count
 
+    def _toggle_highlight_numbering(self):
+        self.highlight_numbering_continuous = not self.highlight_numbering_continuous
+        self.refresh_highlight_preview_if_visible()
+
+    # cmd:// links in the highlight view
+    _HIGHLIGHT_COMMANDS = {
+        "close": lambda self: self.show_highlight_preview(),
+        "export_pdf": lambda self: self.export_current_highlights(),
+        "toggle_numbering": lambda self: self._toggle_highlight_numbering(),
+    }
+
+    def _highlight_cmd_link(self, url):
+        # Handle cmd://command (host) or cmd:///command (path)
+        command = url.host() if url.host() else url.path().strip('/')
+        handler = self._HIGHLIGHT_COMMANDS.get(command)
+        if handler:
+            handler(self)
+
+    def _highlight_note_link(self, url):
+        self._open_note_and_scroll(url.path())
+
+    def _highlight_jump_link(self, url):
+        # format: jump://note_id/text_snippet
+        # Robust URL parsing using QUrl methods
+        note_id = url.host()
+        path = url.path()
+        
+        # path includes leading slash, remove it
+        if path.startswith('/'):
+            path = path[1:]
+            
+        if note_id and path:
+            text = unquote(path)
+            self._open_note_and_scroll(note_id, text)
+
+    _HIGHLIGHT_LINK_SCHEMES = {
+        "cmd": _highlight_cmd_link,
+        "note": _highlight_note_link,
+        "jump": _highlight_jump_link,
+    }
+
     def handle_highlight_link(self, url):
         """Handle execution of links from highlight view"""
-        scheme = url.scheme()
-        if scheme == "cmd":
-            # Handle cmd://command (host) or cmd:///command (path)
-            command = url.host() if url.host() else url.path().strip('/')
-            
-            if command == "close":
-                self.show_highlight_preview()
-            elif command == "export_pdf":
-                self.export_current_highlights()
-            elif command == "toggle_numbering":
-                self.highlight_numbering_continuous = not self.highlight_numbering_continuous
-                self.refresh_highlight_preview_if_visible()
-        elif scheme == "note":
-            note_id = url.path()
-            self._open_note_and_scroll(note_id)
-        elif scheme == "jump":
-            # format: jump://note_id/text_snippet
-            # Robust URL parsing using QUrl methods
-            note_id = url.host()
-            path = url.path()
-            
-            # path includes leading slash, remove it
-            if path.startswith('/'):
-                path = path[1:]
-                
-            if note_id and path:
-                from urllib.parse import unquote
-                text = unquote(path)
-                self._open_note_and_scroll(note_id, text)
+        handler = self._HIGHLIGHT_LINK_SCHEMES.get(url.scheme())
+        if handler:
+            handler(self, url)
+
+    def _render_highlight_view(self, sorted_notes):
+        """Fill the highlight view, skipping the rebuild when it already shows these notes."""
+        # str hashes are cached, so this is cheap unless a note's content was replaced
+        key = (self.current_folder.id, self.current_folder.name, self.highlight_numbering_continuous,
+               self.data_manager.get_setting("theme_mode", "light"),
+               self.data_manager.get_setting("custom_highlight_color", "cyan"),
+               tuple((n.id, n.title, hash(n.content)) for n in sorted_notes))
+        if key == self._highlight_view_key:
+            return
+        grouped_highlights, total_count = self._extract_highlights(sorted_notes)
+        html_content = self._generate_highlight_preview_html(grouped_highlights, total_count)
+        # Most edits touch no highlight; keep the laid-out document rather than rebuild an identical one
+        if html_content != self._highlight_view_html:
+            self.highlight_view.setHtml(html_content)
+            self._highlight_view_html = html_content
+        self._highlight_view_key = key
 
     def refresh_highlight_preview_if_visible(self):
-        """Refreshes the highlight preview if it is currently visible, maintaining scroll."""
+        """Schedules a highlight preview refresh if it is currently visible."""
+        # A hidden view needs nothing: show_highlight_preview() renders on show
+        if hasattr(self, 'highlight_view') and self.highlight_view.isVisible():
+            self._hl_refresh_timer.start()
+
+    def _do_refresh_highlight_preview(self):
+        """Refreshes the highlight preview if it is still visible, maintaining scroll."""
         try:
             if hasattr(self, 'highlight_view') and self.highlight_view.isVisible():
                 # SAFETY: Ensure we have a valid folder with notes
@@ -2859,6 +3148,7 @@ class MainWindow(QMainWindow):
                     grouped_highlights, total_count = {}, 0
                     html_content = self._generate_highlight_preview_html(grouped_highlights, total_count)
                     self.highlight_view.setHtml(html_content)
+                    self._highlight_view_key = self._highlight_view_html = None
                     return
                 
                 # Save Scroll Position
@@ -2866,16 +3156,7 @@ class MainWindow(QMainWindow):
                 v_pos = v_scroll_bar.value()
                 
                 # Re-extract
-                try:
-                     sorted_notes = sorted(self.current_folder.notes, key=lambda n: n.order)
-                except Exception:
-                     sorted_notes = self.current_folder.notes
-                     
-                grouped_highlights, total_count = self._extract_highlights(sorted_notes)
-                
-                # Generate HTML
-                html_content = self._generate_highlight_preview_html(grouped_highlights, total_count)
-                self.highlight_view.setHtml(html_content)
+                self._render_highlight_view(self.current_folder.sorted_notes)
                 
                 # Restore Scroll
                 v_scroll_bar.setValue(v_pos)
@@ -2920,7 +3201,6 @@ class MainWindow(QMainWindow):
 
     def _generate_highlight_preview_html(self, grouped_highlights, total_count, override_theme=None, for_export=False):
         """Generate HTML (Links instead of badges)"""
-        from PyQt6.QtGui import QColor
         if override_theme:
             is_dark = (override_theme == "dark")
         else:
@@ -2931,7 +3211,7 @@ class MainWindow(QMainWindow):
         border = "#444" if is_dark else "#ddd"
         link = "#4da6ff" if is_dark else "#0066cc"
         
-        html = f'''<!DOCTYPE html><html><head><meta charset="UTF-8"><style>
+        parts = [f'''<!DOCTYPE html><html><head><meta charset="UTF-8"><style>
         body{{font-family:'Segoe UI';padding:20px;background-color:{bg};color:{text};}}
         
         .btn {{
@@ -2976,11 +3256,11 @@ class MainWindow(QMainWindow):
         <td width="100%" valign="middle">
             <div style="font-size:1.4em;font-weight:bold;color:{link};">{self.current_folder.name}</div>
         </td>
-        <td valign="middle" style="white-space:nowrap;">'''
+        <td valign="middle" style="white-space:nowrap;">''']
             
         # Hide Buttons for PDF Export
         if not for_export:
-            html += f'''
+            parts.append(f'''
                 <!-- Buttons Table -->
                 <table border="0" cellpadding="0" cellspacing="0">
                     <tr>
@@ -2992,12 +3272,12 @@ class MainWindow(QMainWindow):
                             <a href="cmd://close" style="text-decoration: none; color: white; font-weight: bold; font-size: 0.9em; display: block;">Close ✕</a>
                         </td>
                     </tr>
-                </table>'''
+                </table>''')
                 
-        html += '''
+        parts.append('''
             </td>
         </tr>
-        </table>'''
+        </table>''')
     
         # Toggle Label Logic (Hide for export)
         toggle_link = ""
@@ -3011,23 +3291,21 @@ class MainWindow(QMainWindow):
                 
             toggle_link = f'<span style="font-size:0.7em; margin-left:15px; font-weight:normal;">Mode: {mode_display} <a href="cmd://toggle_numbering" style="color:{link};text-decoration:none;margin-left:5px;">[{toggle_text}]</a></span>'
         
-        html += f'''<h3>Highlights ({total_count}){toggle_link}</h3>
+        parts.append(f'''<h3>Highlights ({total_count}){toggle_link}</h3>
         
         <div class="toc">
             <span class="toc-title">Table of Contents</span>
-            <ul>'''
-            
-        from urllib.parse import quote
+            <ul>''')
         
         # TOC Generator
         for note_id, group in grouped_highlights.items():
-             html += f'<li><a href="note://{note_id}">{group["title"]}</a> <span style="color:#888;font-size:0.9em;">({len(group["items"])})</span></li>'
-        html += '</ul></div>'
+             parts.append(f'<li><a href="note://{note_id}">{group["title"]}</a> <span style="color:#888;font-size:0.9em;">({len(group["items"])})</span></li>')
+        parts.append('</ul></div>')
         
         # Content Generator
         global_idx = 1
         for note_id, group in grouped_highlights.items():
-            html += f'<div class="note-section"><div class="note-title">{group["title"]}</div>'
+            parts.append(f'<div class="note-section"><div class="note-title">{group["title"]}</div>')
             for i, item in enumerate(group['items'], 1):
                 
                 # Numbering Logic
@@ -3079,7 +3357,7 @@ class MainWindow(QMainWindow):
                 # We use a nested table for the item to handle Indentation + Layout
                 # Indent is REMOVED from table margin and applied to content cell
                 
-                html += f'''
+                parts.append(f'''
                 <table border="0" cellpadding="0" cellspacing="0" width="100%" style="margin-bottom:6px;">
                     <tr>
                         <td width="24" valign="top" style="vertical-align:top;padding-top:4px;">
@@ -3093,24 +3371,16 @@ class MainWindow(QMainWindow):
                         </td>
                     </tr>
                 </table>
-                '''
-            html += '</div>'
+                ''')
+            parts.append('</div>')
             
-        html += '</body></html>'
-        return html
+        parts.append('</body></html>')
+        return ''.join(parts)
 
 
     def _export_highlights_pdf(self, grouped_highlights, total_count):
         """Export highlights to PDF"""
-        from PyQt6.QtWidgets import QFileDialog
-        import os
-        
-        default_name = f"{self.current_folder.name}_highlights.pdf"
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "Export Highlights to PDF",
-            os.path.join(os.path.expanduser("~"), default_name),
-            "PDF Files (*.pdf)"
-        )
+        file_path = self._choose_export_path(f"{self.current_folder.name}_highlights.pdf", "Export Highlights to PDF", "PDF Files (*.pdf)")
         
         if not file_path:
             return
@@ -3118,7 +3388,6 @@ class MainWindow(QMainWindow):
         # Use simple logic first
         try:
             html_content = self._generate_highlight_preview_html(grouped_highlights, total_count)
-            from pdf_export.exporter import export_html_to_pdf
             
             # Theme Selection Dialog
             current_theme = self.data_manager.get_setting("theme_mode", "light")
@@ -3139,7 +3408,7 @@ class MainWindow(QMainWindow):
                 for_export=True
             )
             
-            export_html_to_pdf(html_content, file_path, self.current_folder.name + " - Highlights", theme=theme_mode)
+            pdf_exporter.export_html_to_pdf(html_content, file_path, self.current_folder.name + " - Highlights", theme=theme_mode)
             self.show_message(QMessageBox.Icon.Information, "Export Complete", 
                              f"Highlights exported successfully to:\n{file_path}")
         except Exception as e:
@@ -3195,13 +3464,7 @@ class MainWindow(QMainWindow):
     def on_delete_note_from_sidebar(self, note_id):
         """Action handler for 'Move to Trash' from sidebar zen view."""
         # Find folder for this note
-        note_to_del = None
-        target_folder = None
-        for folder in self.data_manager.folders:
-            note_to_del = next((n for n in folder.notes if n.id == note_id), None)
-            if note_to_del:
-                target_folder = folder
-                break
+        target_folder, note_to_del = self.data_manager.find_note_by_id(note_id)
         
         if target_folder and note_to_del:
             self.data_manager.delete_note(target_folder, note_id)
@@ -3210,9 +3473,7 @@ class MainWindow(QMainWindow):
 
     def on_clear_all_recent(self):
         """Action handler for 'Clear All Recent'."""
-        reply = QMessageBox.question(self, "Clear Recent", "Hide all notes from Recent view? This doesn't delete the notes.",
-                                   QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-        if reply == QMessageBox.StandardButton.Yes:
+        if self._confirm("Clear Recent", "Hide all notes from Recent view? This doesn't delete the notes."):
             self.data_manager.clear_all_recent()
             self.on_sidebar_section_changed("RECENT")
 
@@ -3225,6 +3486,7 @@ class MainWindow(QMainWindow):
         if details:
             msg.setDetailedText(details)
         msg.setWindowFlags(msg.windowFlags() | Qt.WindowType.WindowStaysOnTopHint)
+        msg.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose) # one box per message; don't pile up under the window
         return msg.exec()
 
     def _refresh_page_metadata(self):
@@ -3240,16 +3502,56 @@ class MainWindow(QMainWindow):
         except Exception:
             self.metadata_bar.set_page_text("PAGE --/--")
 
+    def _schedule_metadata_refresh(self):
+        """Trigger a debounced metadata refresh."""
+        if self.current_note is not None:
+            self.metadata_timer.start()
+
+    def _recount_words(self):
+        doc = self.editor.editor.document()
+        counts = []
+        block = doc.firstBlock()
+        while block.isValid():
+            counts.append(_count_words(block.text()))
+            block = block.next()
+        self._block_words = counts
+        self._word_count = sum(counts)
+
+    def _on_contents_change(self, pos, removed, added):
+        """Recount only the blocks covered by the edit."""
+        doc = self.editor.editor.document()
+        first = doc.findBlock(pos)
+        last = doc.findBlock(min(pos + added, doc.characterCount() - 1))
+        if not first.isValid() or not last.isValid():
+            self._recount_words()
+            return
+
+        start = first.blockNumber()
+        new_len = last.blockNumber() - start + 1
+        old_len = new_len - (doc.blockCount() - len(self._block_words))
+        if old_len < 1 or start + old_len > len(self._block_words):
+            self._recount_words()
+            return
+
+        counts = []
+        block = first
+        for _ in range(new_len):
+            counts.append(_count_words(block.text()))
+            block = block.next()
+        old = self._block_words[start:start + old_len]
+        self._block_words[start:start + old_len] = counts
+        self._word_count += sum(counts) - sum(old)
+
     def refresh_metadata(self):
         """Update the metadata bar with current editor stats."""
-        if not self.current_note:
+        # Nothing to show while the empty state covers the editor
+        if not self.current_note or self.editor_stack.currentWidget() is not self.editor_container:
             return
             
-        text = self.editor.editor.toPlainText()
+        chars = self.editor.editor.document().characterCount() - 1 # Excludes the trailing paragraph separator
         
         # Format modified time
         modified_time = "--"
-        from datetime import datetime
         
         raw_ts = getattr(self.current_note, 'modified_at', None) or getattr(self.current_note, 'created_at', None)
         
@@ -3265,7 +3567,7 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 logger.error(f"Error parsing timestamp {raw_ts}: {e}")
              
-        self.metadata_bar.update_stats(text, modified_time, self.editor.get_page_progress_text())
+        self.metadata_bar.update_stats(self._word_count, chars, modified_time, self.editor.get_page_progress_text())
 
     def on_view_mode_changed(self, mode):
         """Persist view mode preference for current folder."""
@@ -44,6 +44,8 @@ class NoteList(QWidget):
         self.wrap_enabled = False
         self.showing_archived = False
         self.current_notes = []
+        self._items_by_id = {} # note_id -> QListWidgetItem for the rows currently shown
+        self._note_rows_start = 0 # 1 when the "Archived Notes" row heads the list
         self.theme_mode = "light"
         self.view_mode = VIEW_MODE_LIST
         
@@ -156,20 +158,11 @@ class NoteList(QWidget):
         
         self.filter_notes(self.search_input.text())
         
-    def filter_notes(self, text):
+    def _visible_notes(self, text):
+        """Notes passing the archive toggle and search text, in display order."""
         from PyQt6.QtGui import QTextDocument
-        from PyQt6.QtWidgets import QListWidgetItem
-        
-        self.list_widget.clear()
-        text = text.lower().strip()
-        
-        # Disable drag-and-drop if filtering
-        is_filtered = bool(text)
-        if is_filtered:
-            self.list_widget.setDragDropMode(QListWidget.DragDropMode.NoDragDrop)
-        else:
-            self.list_widget.setDragDropMode(QListWidget.DragDropMode.InternalMove)
 
+        is_filtered = bool(text)
         doc = QTextDocument()
         filtered_notes = []
         for note in self.current_notes:
@@ -202,6 +195,30 @@ class NoteList(QWidget):
             return (pinned_rank, priority_rank, order_rank)
 
         filtered_notes.sort(key=sort_key)
+        return filtered_notes
+
+    def _note_label(self, idx, note):
+        note_title = str(note.title) if note.title else "Untitled"
+        prefix = ""
+        p = getattr(note, 'priority', 0)
+        if p == 1: prefix += "❶ "
+        elif p == 2: prefix += "❷ "
+        elif p == 3: prefix += "❸ "
+        return f"{idx}. {prefix}{note_title.strip()}"
+
+    def filter_notes(self, text):
+        self.list_widget.clear()
+        self._items_by_id = {}
+        self._note_rows_start = 0
+        text = text.lower().strip()
+        
+        # Disable drag-and-drop if filtering
+        if text:
+            self.list_widget.setDragDropMode(QListWidget.DragDropMode.NoDragDrop)
+        else:
+            self.list_widget.setDragDropMode(QListWidget.DragDropMode.InternalMove)
+
+        filtered_notes = self._visible_notes(text)
 
         if not self.showing_archived and not text:
             archived_count = sum(1 for n in self.current_notes if getattr(n, 'is_archived', False))
@@ -217,22 +234,16 @@ class NoteList(QWidget):
                 font.setBold(True)
                 archived_item.setFont(font)
                 self.list_widget.addItem(archived_item)
+                self._note_rows_start = 1
 
         for idx, note in enumerate(filtered_notes, 1):
             try:
-                note_title = str(note.title) if note.title else "Untitled"
-                prefix = ""
-                p = getattr(note, 'priority', 0)
-                if p == 1: prefix += "❶ "
-                elif p == 2: prefix += "❷ "
-                elif p == 3: prefix += "❸ "
-                
                 # Combine Indicators
                 indicators = ["note"]
                 if getattr(note, 'is_pinned', False): indicators.append("pin")
                 if getattr(note, 'is_locked', False): indicators.append("lock")
                 
-                item = QListWidgetItem(f"{idx}. {prefix}{note_title.strip()}")
+                item = QListWidgetItem(self._note_label(idx, note))
                 c = styles.ZEN_THEME.get(self.theme_mode, styles.ZEN_THEME["light"])
                 icon_color = c.get('sidebar_fg', c.get('foreground', '#000000'))
                 item.setIcon(get_combined_indicators(indicators, color=icon_color))
@@ -244,7 +255,54 @@ class NoteList(QWidget):
                 if getattr(note, 'color', None):
                     item.setData(COLOR_ROLE, note.color)
                 self.list_widget.addItem(item)
+                self._items_by_id[note.id] = item
             except Exception: continue
+
+    def _renumber_from(self, row):
+        start = self._note_rows_start
+        for r in range(max(row, start), self.list_widget.count()):
+            item = self.list_widget.item(r)
+            item.setText(self._note_label(r - start + 1, item.data(Qt.ItemDataRole.UserRole + 1)))
+
+    def update_item(self, note_id):
+        """Refresh one row's label in place; returns False if the caller should reload the list."""
+        item = self._items_by_id.get(note_id)
+        if item is None or self.search_input.text().strip():
+            return False
+        row = self.list_widget.row(item)
+        item.setText(self._note_label(row - self._note_rows_start + 1, item.data(Qt.ItemDataRole.UserRole + 1)))
+        return True
+
+    def remove_item(self, note_id):
+        """Drop one row and renumber the rows below it; returns False if it is not listed."""
+        item = self._items_by_id.pop(note_id, None)
+        if item is None:
+            return False
+        self.current_notes = [n for n in self.current_notes if n.id != note_id]
+        row = self.list_widget.row(item)
+        self.list_widget.takeItem(row)
+        self._renumber_from(row)
+        return True
+
+    def move_item(self, note_id):
+        """Seat one row at its sorted position after a reorder; returns False if a reload is needed."""
+        item = self._items_by_id.get(note_id)
+        if item is None or self.search_input.text().strip():
+            return False
+        expected = [n.id for n in self._visible_notes("")]
+        if note_id not in expected:
+            return False
+        start = self._note_rows_start
+        row = self.list_widget.row(item)
+        target = start + expected.index(note_id)
+        if row != target:
+            self.list_widget.takeItem(row)
+            self.list_widget.insertItem(target, item)
+        shown = [self.list_widget.item(r).data(Qt.ItemDataRole.UserRole) for r in range(start, self.list_widget.count())]
+        if shown != expected:
+            return False
+        self._renumber_from(min(row, target))
+        return True
         
     def on_item_clicked(self, item):
         if not item: return
@@ -489,14 +547,12 @@ class NoteList(QWidget):
 
     def select_note_by_id(self, note_id):
         print(f"DEBUG: NoteList.select_note_by_id CALLED: note_id='{note_id}'")
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if item.data(Qt.ItemDataRole.UserRole) == note_id:
-                print(f"DEBUG: Found item for note {note_id} at index {i}. Setting as current.")
-                self.list_widget.setCurrentItem(item)
-                # Manually trigger the selection logic so it emits noteSelected
-                self.on_item_clicked(item)
-                break
+        item = self._items_by_id.get(note_id)
+        if item is not None:
+            print(f"DEBUG: Found item for note {note_id} at index {self.list_widget.row(item)}. Setting as current.")
+            self.list_widget.setCurrentItem(item)
+            # Manually trigger the selection logic so it emits noteSelected
+            self.on_item_clicked(item)
 
     def toggle_archived_view(self):
         self.showing_archived = not self.showing_archived
@@ -21,6 +21,7 @@ class PreviewWorker(QThread):
         self.theme = theme
         self.start_index = start_index
         self._is_running = True
+        self.completed = False # True once every chunk has been emitted
 
     def stop(self):
         self._is_running = False
@@ -99,6 +100,7 @@ class PreviewWorker(QThread):
                 if self._is_running:
                     self.chunkReady.emit(full_note_chunk)
 
+            self.completed = True
             self.finished.emit()
             
         except Exception as e:
@@ -107,7 +109,7 @@ class PreviewWorker(QThread):
 class PDFPreviewDialog(ZenDialog):
     exportConfirmed = pyqtSignal(int)
 
-    def __init__(self, folder, whiteboard_images, parent=None, current_theme_mode="light", start_index=1):
+    def __init__(self, folder, whiteboard_images, parent=None, current_theme_mode="light", start_index=1, cached_chunks=None):
         # Auto-detect theme
         theme_mode = "light"
         if parent and hasattr(parent, 'theme_mode'):
@@ -120,6 +122,9 @@ class PDFPreviewDialog(ZenDialog):
         self.whiteboard_images = whiteboard_images
         self.start_index = start_index
         self.current_theme = 1 if current_theme_mode == "dark" else 0
+        self._cached_chunks = cached_chunks
+        self._chunks = []
+        self.rendered_chunks = None # Complete render, reusable as `cached_chunks` next time
         
         self.resize(1000, 950)
             
@@ -166,7 +171,14 @@ class PDFPreviewDialog(ZenDialog):
         self.content_layout.addLayout(btn_layout)
 
     def _start_preview_worker(self):
-        """Initializes and starts the background preview worker."""
+        """Initializes and starts the background preview worker, or replays a cached render."""
+        if self._cached_chunks is not None:
+            self.preview_browser.clear()
+            for chunk in self._cached_chunks:
+                self._append_chunk(chunk)
+            self._on_worker_finished()
+            return
+
         self.worker = PreviewWorker(self.folder, self.whiteboard_images, self.current_theme, self.start_index)
         self.worker.progress.connect(self._update_progress)
         self.worker.chunkReady.connect(self._append_chunk)
@@ -186,6 +198,7 @@ class PDFPreviewDialog(ZenDialog):
     @pyqtSlot(str)
     def _append_chunk(self, html_chunk):
         """Append HTML piece to the browser without a full reload."""
+        self._chunks.append(html_chunk)
         cursor = self.preview_browser.textCursor()
         cursor.movePosition(QTextCursor.MoveOperation.End)
         cursor.insertHtml(html_chunk)
@@ -193,6 +206,8 @@ class PDFPreviewDialog(ZenDialog):
             self.preview_browser.verticalScrollBar().setValue(0)
 
     def _on_worker_finished(self):
+        if self._cached_chunks is not None or self.worker.completed:
+            self.rendered_chunks = self._chunks
         self.status_label.setText(f"Preview ready ({len(self.folder.notes)} notes)")
         self.status_label.setStyleSheet("color: #7B9E87; font-weight: bold;")
         self.progress_bar.setValue(100)
@@ -204,12 +219,13 @@ class PDFPreviewDialog(ZenDialog):
         self.status_label.setStyleSheet("color: red; font-weight: bold;")
         self.progress_bar.hide()
 
-    def closeEvent(self, event):
-        """Safely stop the worker when closing the dialog."""
+    def done(self, result):
+        """Safely stop the worker when the dialog finishes, however it was closed."""
+        # accept()/reject() (Close, Esc, title bar) end here without a closeEvent
         if hasattr(self, 'worker') and self.worker.isRunning():
             self.worker.stop()
             self.worker.wait()
-        super().closeEvent(event)
+        super().done(result)
 
     def accept_export(self):
         self.exportConfirmed.emit(self.current_theme)
@@ -11,7 +11,7 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTo
                               QColorDialog, QPushButton, QLabel, QSlider, 
                               QFileDialog, QMessageBox, QComboBox,
                               QCheckBox, QFrame, QSizePolicy)
-from PyQt6.QtCore import Qt, QPointF, QSize, pyqtSignal, QSettings, QRectF, QSizeF
+from PyQt6.QtCore import Qt, QPointF, QSize, pyqtSignal, QSettings, QRectF, QSizeF, QObject, QRunnable, QThreadPool
 from PyQt6.QtGui import (QPainter, QPen, QColor, QAction, QActionGroup,
                          QIcon, QCursor, QPixmap, QImage)
 import ui.styles as styles
@@ -35,6 +35,37 @@ InkCanvas = scrble_module.InkCanvas
 ModernMessageBox = scrble_module.ModernMessageBox
 
 
+class WhiteboardFileReader(QObject):
+    """Reads and parses a whiteboard JSON file off the GUI thread."""
+
+    loaded = pyqtSignal(str, object)  # filepath, parsed dict (None on error)
+
+    def __init__(self, filepath, parent=None):
+        super().__init__(parent)
+        self.filepath = filepath
+
+    def read(self):
+        try:
+            with open(self.filepath, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading: {e}")
+            data = None
+        self.loaded.emit(self.filepath, data)
+
+
+class WhiteboardLoadTask(QRunnable):
+    """Runnable wrapper for WhiteboardFileReader."""
+
+    def __init__(self, reader):
+        super().__init__()
+        self.reader = reader
+        self.setAutoDelete(True)
+
+    def run(self):
+        self.reader.read()
+
+
 class WhiteboardWidget(QMainWindow):
     """
     Embeddable whiteboard widget for note application.
@@ -55,6 +86,8 @@ class WhiteboardWidget(QMainWindow):
         self.pages = [Page(name="Page 1")]
         self.current_page_index = 0
         self.active_file_path = None
+        self._pending_load_path = None # File being read by load_file_async()
+        self._readers = [] # Keeps in-flight WhiteboardFileReaders alive
         self.folder_name = "Unsaved"
         
         # Color Palette (Copied from ScrbleInkPro)
@@ -981,6 +1014,7 @@ class WhiteboardWidget(QMainWindow):
 
     def load_file(self, filepath):
         """Load whiteboard from JSON file"""
+        self._pending_load_path = None # Supersedes any background load
         self.active_file_path = filepath
         if not os.path.exists(filepath):
             self.pages = [Page(name="Page 1")]
@@ -991,6 +1025,38 @@ class WhiteboardWidget(QMainWindow):
         try:
             with open(filepath, 'r') as f:
                 data = json.load(f)
+        except Exception as e:
+            print(f"Error loading: {e}")
+            data = None
+        self._apply_file_data(data)
+
+    def load_file_async(self, filepath):
+        """Load whiteboard from JSON file, reading and parsing it on the thread pool.
+
+        The current board (and active_file_path) stay in place until the data
+        arrives, so an auto-save in the meantime still targets the old file.
+        """
+        if not os.path.exists(filepath):
+            self.load_file(filepath)
+            return
+        self._pending_load_path = filepath
+        reader = WhiteboardFileReader(filepath)
+        reader.loaded.connect(self._on_file_read)
+        self._readers.append(reader)
+        QThreadPool.globalInstance().start(WhiteboardLoadTask(reader))
+
+    def _on_file_read(self, filepath, data):
+        self._readers = [r for r in self._readers if r is not self.sender()]
+        if filepath != self._pending_load_path:
+            return # Superseded by a later load
+        self._pending_load_path = None
+        self.active_file_path = filepath
+        self._apply_file_data(data)
+
+    def _apply_file_data(self, data):
+        try:
+            if data is None:
+                raise ValueError("unreadable whiteboard file")
             self.pages = [Page.from_dict(p) for p in data.get('pages', [])]
             if not self.pages: self.pages = [Page(name="Page 1")]
             self.current_page_index = data.get('current_page', 0)
@@ -1004,6 +1070,7 @@ class WhiteboardWidget(QMainWindow):
 
     def clear(self):
         """Reset the whiteboard to a single blank page."""
+        self._pending_load_path = None
         self.pages = [Page(name="Page 1")]
         self.current_page_index = 0
         if hasattr(self, 'canvas'):